@@ -2,13 +2,31 @@
 # Ed25519 signature generation for FairLens verifier attestations
 # This module handles off-chain signature generation for AI/inspector attestations
 
+import os
+import sys
 import json
 import time
-from typing import Dict, Tuple
-from nacl.signing import SigningKey
+import argparse
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from nacl.signing import SigningKey, VerifyKey
 from nacl.encoding import HexEncoder
+from nacl.exceptions import BadSignatureError
 import hashlib
 
+def program_signed_data(message: bytes, program_hash: bytes = None) -> bytes:
+    """
+    Bytes actually covered by the signature.
+    The AVM's ed25519verify checks "ProgData" || program_hash || data, where
+    program_hash is SHA-512/256("Program" || approval bytecode).
+    """
+    if program_hash is None:
+        return message
+    if len(program_hash) != 32:
+        raise ValueError("program hash must be 32 bytes")
+    return b"ProgData" + program_hash + message
+
 class FairLensVerifier:
     """
     Handles Ed25519 signature generation for FairLens attestations.
@@ -28,7 +46,8 @@ class FairLensVerifier:
         self.verify_key = self.signing_key.verify_key
         self.public_key_hex = self.verify_key.encode(encoder=HexEncoder).decode()
     
-    def create_attestation_message(self, app_id: int, milestone_index: int, 
+    @staticmethod
+    def create_attestation_message(app_id: int, milestone_index: int, 
                                  status: str, timestamp: int, 
                                  milestone_hash: str, proof_hash: str = "") -> bytes:
         """
@@ -40,9 +59,13 @@ class FairLensVerifier:
     
     def sign_attestation(self, app_id: int, milestone_index: int, 
                         status: str, milestone_hash: str, 
-                        proof_hash: str = "", timestamp: int = None) -> Tuple[bytes, bytes]:
+                        proof_hash: str = "", timestamp: int = None,
+                        program_hash: bytes = None) -> Tuple[bytes, bytes]:
         """
         Sign an attestation for a milestone.
+        Pass the 32-byte hash of the app's approval program to produce a
+        signature the contract's Ed25519Verify accepts, which checks
+        "ProgData" || program_hash || message rather than the bare message.
         Returns: (message_bytes, signature_bytes)
         """
         if timestamp is None:
@@ -52,15 +75,16 @@ class FairLensVerifier:
             app_id, milestone_index, status, timestamp, milestone_hash, proof_hash
         )
         
-        signature = self.signing_key.sign(message).signature
+        signature = self.signing_key.sign(program_signed_data(message, program_hash)).signature
         return message, signature
     
-    def verify_attestation(self, message: bytes, signature: bytes) -> bool:
+    def verify_attestation(self, message: bytes, signature: bytes,
+                           program_hash: bytes = None) -> bool:
         """
         Verify an attestation signature (for testing).
         """
         try:
-            self.verify_key.verify(message, signature)
+            self.verify_key.verify(program_signed_data(message, program_hash), signature)
             return True
         except:
             return False
@@ -73,8 +97,245 @@ class FairLensVerifier:
         """Get the hex-encoded public key."""
         return self.public_key_hex
 
-# Example usage and testing
-if __name__ == "__main__":
+# ---------------------------
+# Streaming JSONL pipeline
+# ---------------------------
+SIGN_FIELDS = ("app_id", "milestone_index", "status", "milestone_hash")
+
+def _string_field(record: Dict, field: str) -> str:
+    value = record[field]
+    if not isinstance(value, str):
+        raise ValueError(f"{field} must be a string, got {type(value).__name__}")
+    return value
+
+def _record_program_hash(record: Dict, default: Optional[bytes]) -> Optional[bytes]:
+    """The record's hex "program_hash" if present, otherwise the job-wide default."""
+    if "program_hash" not in record:
+        return default
+    program_hash = bytes.fromhex(_string_field(record, "program_hash"))
+    if len(program_hash) != 32:
+        raise ValueError("program_hash must be 32 bytes")
+    return program_hash
+
+def sign_record(verifier: FairLensVerifier, record: Dict,
+                program_hash: Optional[bytes] = None) -> Dict:
+    """
+    Sign one attestation request.
+    Input: {app_id, milestone_index, status, milestone_hash, [proof_hash], [timestamp], [program_hash]}
+    Output: the request fields plus verifier_pubkey, message and signature (hex),
+    and program_hash when the signature is bound to an approval program.
+    """
+    missing = [field for field in SIGN_FIELDS if field not in record]
+    if missing:
+        raise ValueError(f"missing field(s): {', '.join(missing)}")
+
+    timestamp = record.get("timestamp")
+    timestamp = int(time.time()) if timestamp is None else int(timestamp)
+    proof_hash = record.get("proof_hash", "")
+    program_hash = _record_program_hash(record, program_hash)
+    message, signature = verifier.sign_attestation(
+        int(record["app_id"]), int(record["milestone_index"]), record["status"],
+        record["milestone_hash"], proof_hash, timestamp, program_hash
+    )
+    result = {
+        "app_id": int(record["app_id"]),
+        "milestone_index": int(record["milestone_index"]),
+        "status": record["status"],
+        "timestamp": timestamp,
+        "milestone_hash": record["milestone_hash"],
+        "proof_hash": proof_hash,
+        "verifier_pubkey": verifier.get_public_key_hex(),
+        "message": message.decode(),
+        "signature": signature.hex()
+    }
+    if program_hash is not None:
+        result["program_hash"] = program_hash.hex()
+    return result
+
+def verify_record(trusted_key: VerifyKey, record: Dict,
+                  program_hash: Optional[bytes] = None) -> Dict:
+    """
+    Re-verify one signed attestation record (as produced by sign_record).
+    The signature is only checked against trusted_key: a record claiming a
+    different verifier_pubkey is invalid whatever its signature. When the
+    attestation fields are present the message must also match them.
+    Output: the input record plus "valid" and, if invalid, "reason".
+    """
+    if "message" not in record or "signature" not in record:
+        raise ValueError("missing field(s): message, signature")
+
+    message = _string_field(record, "message").encode('utf-8')
+    signature = bytes.fromhex(_string_field(record, "signature"))
+    program_hash = _record_program_hash(record, program_hash)
+    trusted_hex = trusted_key.encode(encoder=HexEncoder).decode()
+    result = dict(record)
+
+    if "verifier_pubkey" in record and _string_field(record, "verifier_pubkey").lower() != trusted_hex:
+        result.update(valid=False, reason="verifier_pubkey is not the trusted verifier key")
+        return result
+
+    if all(field in record for field in SIGN_FIELDS + ("timestamp",)):
+        expected = FairLensVerifier.create_attestation_message(
+            int(record["app_id"]), int(record["milestone_index"]), record["status"],
+            int(record["timestamp"]), record["milestone_hash"], record.get("proof_hash", "")
+        )
+        if expected != message:
+            result.update(valid=False, reason="message does not match attestation fields")
+            return result
+
+    try:
+        trusted_key.verify(program_signed_data(message, program_hash), signature)
+        result["valid"] = True
+    except (BadSignatureError, ValueError):
+        result.update(valid=False, reason="bad signature")
+    return result
+
+def load_context(mode: str, key_hex: str):
+    """Signing key for "sign", trusted public key for "verify"."""
+    if mode == "sign":
+        return FairLensVerifier(key_hex)
+    return VerifyKey(key_hex, encoder=HexEncoder)
+
+RECORD_HANDLERS = {
+    "sign": sign_record,
+    "verify": verify_record,
+}
+
+# Per-process key and program hash for pool workers, set once by the initializer
+_worker_context = None
+_worker_program_hash: Optional[bytes] = None
+
+def _init_worker(mode: str, key_hex: str, program_hash: Optional[bytes]) -> None:
+    global _worker_context, _worker_program_hash
+    _worker_context = load_context(mode, key_hex)
+    _worker_program_hash = program_hash
+
+def process_chunk(mode: str, lines: List[Tuple[str, int, str]],
+                  context=None, program_hash: Optional[bytes] = None) -> Tuple[List[str], int, int]:
+    """
+    Process a chunk of (source, line_number, text) input lines.
+    Returns the JSONL output lines, the number of records that failed and the
+    number of records that verified as invalid.
+    Malformed records produce an {"source", "line", "error"} record instead of aborting.
+    """
+    if context is None:
+        context, program_hash = _worker_context, _worker_program_hash
+    handler = RECORD_HANDLERS[mode]
+    output, errors, invalid = [], 0, 0
+    for source, line_number, text in lines:
+        try:
+            record = json.loads(text)
+            if not isinstance(record, dict):
+                raise ValueError("record is not a JSON object")
+            result = handler(context, record, program_hash)
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            result = {"source": source, "line": line_number, "error": str(e)}
+            errors += 1
+        if result.get("valid") is False:
+            invalid += 1
+        output.append(json.dumps(result, separators=(',', ':')))
+    return output, errors, invalid
+
+def iter_input_lines(paths: List[str]) -> Iterator[Tuple[str, int, str]]:
+    """Lazily yield non-blank (source, line_number, text) from files, or stdin for "-"."""
+    for path in paths or ["-"]:
+        stream = sys.stdin if path == "-" else open(path, encoding='utf-8')
+        try:
+            for line_number, text in enumerate(stream, 1):
+                if text.strip():
+                    yield ("<stdin>" if path == "-" else path), line_number, text
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+def iter_chunks(lines: Iterable, size: int) -> Iterator[List]:
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class ProgressReporter:
+    """Periodic throughput/progress lines on stderr."""
+
+    def __init__(self, interval: float, stream: Optional[TextIO] = None):
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.started = time.perf_counter()
+        self.last_report = self.started
+        self.records = 0
+        self.errors = 0
+        self.invalid = 0
+
+    def update(self, records: int, errors: int, invalid: int = 0) -> None:
+        self.records += records
+        self.errors += errors
+        self.invalid += invalid
+        now = time.perf_counter()
+        if self.interval > 0 and now - self.last_report >= self.interval:
+            self.last_report = now
+            self._report(now, "progress")
+
+    def finish(self) -> None:
+        self._report(time.perf_counter(), "done")
+
+    def _report(self, now: float, label: str) -> None:
+        elapsed = now - self.started
+        rate = self.records / elapsed if elapsed else 0.0
+        print(f"[{label}] {self.records} records, {self.errors} errors, {self.invalid} invalid, "
+              f"{elapsed:.1f}s, {rate:.0f} records/s", file=self.stream, flush=True)
+
+def run_pipeline(mode: str, key_hex: str, paths: List[str], out: TextIO,
+                 workers: int = 1, chunk_size: int = 512, ordered: bool = True,
+                 progress_interval: float = 5.0, program_hash: Optional[bytes] = None) -> Tuple[int, int]:
+    """
+    Stream JSONL records through sign/verify and write JSONL results to out.
+    key_hex is the verifier's private key when signing and the trusted
+    verifier public key when verifying.
+    Memory stays bounded: at most 2 * workers chunks are in flight at a time.
+    Returns the number of records that failed and the number that verified
+    as invalid (always 0 when signing).
+    """
+    progress = ProgressReporter(progress_interval)
+    chunks = iter_chunks(iter_input_lines(paths), chunk_size)
+
+    def emit(result: Tuple[List[str], int, int]) -> None:
+        output, errors, invalid = result
+        if output:
+            out.write("\n".join(output) + "\n")
+        progress.update(len(output), errors, invalid)
+
+    if workers <= 1:
+        context = load_context(mode, key_hex)
+        for chunk in chunks:
+            emit(process_chunk(mode, chunk, context, program_hash))
+    else:
+        max_in_flight = 2 * workers
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(mode, key_hex, program_hash)) as executor:
+            in_flight = deque()
+            for chunk in chunks:
+                in_flight.append(executor.submit(process_chunk, mode, chunk))
+                while len(in_flight) >= max_in_flight:
+                    if ordered:
+                        emit(in_flight.popleft().result())
+                    else:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            in_flight.remove(future)
+                            emit(future.result())
+            while in_flight:
+                emit(in_flight.popleft().result())
+
+    out.flush()
+    progress.finish()
+    return progress.errors, progress.invalid
+
+def run_demo() -> None:
+    """Sign and verify one example attestation."""
     # Create verifier instance
     verifier = FairLensVerifier()
     
@@ -114,3 +375,77 @@ if __name__ == "__main__":
     
     print(f"\nJSON Attestation:")
     print(json.dumps(attestation_json, indent=2))
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="FairLens attestation signing and verification")
+    subparsers = parser.add_subparsers(dest="command")
+
+    for command, help_text in (("sign", "sign JSONL attestation requests"),
+                               ("verify", "re-verify signed JSONL attestation records")):
+        sub = subparsers.add_parser(command, help=help_text)
+        sub.add_argument("inputs", nargs="*", help="JSONL input files (default: stdin, or '-')")
+        if command == "sign":
+            sub.add_argument("--key-hex", default=os.getenv("VERIFIER_PRIVATE_KEY"),
+                             help="hex Ed25519 private key (default: $VERIFIER_PRIVATE_KEY)")
+            sub.set_defaults(allow_invalid=False)
+        else:
+            sub.add_argument("--pubkey-hex", dest="key_hex", default=os.getenv("VERIFIER_PUBKEY"),
+                             help="trusted hex Ed25519 verifier public key (default: $VERIFIER_PUBKEY)")
+            sub.add_argument("--allow-invalid", action="store_true",
+                             help="exit 0 even when some records fail verification")
+        sub.add_argument("--program-hash-hex",
+                         help="hex SHA-512/256 hash of the approval program, for signatures the "
+                              "contract's Ed25519Verify accepts (per-record \"program_hash\" overrides)")
+        sub.add_argument("--workers", type=int, default=1,
+                         help="worker processes (default: %(default)s)")
+        sub.add_argument("--chunk-size", type=int, default=512,
+                         help="records per work unit (default: %(default)s)")
+        sub.add_argument("--unordered", action="store_true",
+                         help="emit results as soon as they are ready instead of in input order")
+        sub.add_argument("--progress-interval", type=float, default=5.0,
+                         help="seconds between progress reports on stderr, 0 to disable (default: %(default)s)")
+
+    subparsers.add_parser("demo", help="sign and verify one example attestation")
+    args = parser.parse_args(argv)
+
+    if args.command in (None, "demo"):
+        run_demo()
+        return 0
+
+    if not args.key_hex:
+        required = "--key-hex or VERIFIER_PRIVATE_KEY" if args.command == "sign" else "--pubkey-hex or VERIFIER_PUBKEY"
+        print(f"Error: {args.command} requires {required}", file=sys.stderr)
+        return 2
+
+    try:
+        load_context(args.command, args.key_hex)
+        program_hash = bytes.fromhex(args.program_hash_hex) if args.program_hash_hex else None
+        if program_hash is not None:
+            program_signed_data(b"", program_hash)
+    except (ValueError, TypeError) as e:
+        print(f"Error: invalid key or program hash: {e}", file=sys.stderr)
+        return 2
+
+    unreadable = [path for path in args.inputs
+                  if path != "-" and not (os.path.isfile(path) and os.access(path, os.R_OK))]
+    if unreadable:
+        print(f"Error: cannot read input file(s): {', '.join(unreadable)}", file=sys.stderr)
+        return 2
+
+    try:
+        errors, invalid = run_pipeline(
+            args.command, args.key_hex, args.inputs, sys.stdout,
+            workers=args.workers, chunk_size=args.chunk_size,
+            ordered=not args.unordered, progress_interval=args.progress_interval,
+            program_hash=program_hash
+        )
+    except OSError as e:
+        # An input vanished or became unreadable mid-run
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    if errors or (invalid and not args.allow_invalid):
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
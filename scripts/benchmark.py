@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# scripts/benchmark.py
+# Micro-benchmark suite for the FairLens Python toolchain
+# Measures attestation signing/verification, PyTeal compilation and
+# deployment transaction construction and signing, stores results as JSON
+# baselines and fails when a run regresses past a configurable threshold.
+#
+# Usage:
+#   python scripts/benchmark.py --save benchmarks/baseline.json
+#   python scripts/benchmark.py --compare benchmarks/baseline.json --threshold 10
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+
+# Add backend, contracts and scripts directories to path
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(os.path.join(ROOT_DIR, 'backend'))
+sys.path.append(os.path.join(ROOT_DIR, 'contracts'))
+sys.path.append(os.path.dirname(__file__))
+
+try:
+    import pyteal
+    from algosdk import account
+    from algosdk.transaction import SuggestedParams
+    from verifier_sign import FairLensVerifier
+    from fairlens_app import approval_program
+    from deploy_testnet import build_create_txn
+except ImportError as e:
+    print(f"Error importing benchmark dependencies: {e}")
+    print("Please install them with: pip install -r backend/requirements.txt")
+    sys.exit(1)
+
+DEFAULT_BASELINE = os.path.join(ROOT_DIR, 'benchmarks', 'baseline.json')
+DEFAULT_THRESHOLD = 10.0  # percent slowdown of the median before failing
+APPROVAL_BIN_PATH = None  # set from --approval-bin
+
+# Fixed attestation inputs so every run measures identical work
+APP_ID = 1234
+MILESTONE_INDEX = 0
+STATUS = "PASS"
+TIMESTAMP = 1700000000
+MILESTONE_HASH = "QmExampleIPFSHash123456789"
+PROOF_HASH = "QmProofHash987654321"
+
+# ---------------------------
+# Benchmark cases
+# ---------------------------
+def bench_create_attestation_message():
+    verifier = FairLensVerifier()
+
+    def run():
+        verifier.create_attestation_message(
+            APP_ID, MILESTONE_INDEX, STATUS, TIMESTAMP, MILESTONE_HASH, PROOF_HASH
+        )
+    return run
+
+def bench_sign_attestation():
+    verifier = FairLensVerifier()
+
+    def run():
+        verifier.sign_attestation(
+            APP_ID, MILESTONE_INDEX, STATUS, MILESTONE_HASH, PROOF_HASH, TIMESTAMP
+        )
+    return run
+
+def bench_verify_attestation():
+    verifier = FairLensVerifier()
+    message, signature = verifier.sign_attestation(
+        APP_ID, MILESTONE_INDEX, STATUS, MILESTONE_HASH, PROOF_HASH, TIMESTAMP
+    )
+
+    def run():
+        verifier.verify_attestation(message, signature)
+    return run
+
+def bench_compile_approval_program():
+    def run():
+        pyteal.compileTeal(approval_program(), pyteal.Mode.Application, version=6)
+    return run
+
+def load_approval_bytecode():
+    """
+    Approval bytecode for the transaction benchmarks.
+    Uses --approval-bin when given (e.g. the decoded "result" of algod's
+    /v2/teal/compile); otherwise a fixed 1 KiB placeholder. build_create_txn
+    copies the program opaquely, so only its size affects the measurement.
+    """
+    if APPROVAL_BIN_PATH:
+        with open(APPROVAL_BIN_PATH, 'rb') as f:
+            return f.read()
+    return b"\x06" + bytes(1023)
+
+def create_txn_inputs():
+    _, sender = account.generate_account()
+    _, owner_address = account.generate_account()
+    _, contractor_address = account.generate_account()
+    params = SuggestedParams(
+        fee=1000, first=1, last=1001,
+        gh="SGO1GKSzyE7IEPItTxCByw9x8FmnrCDexi9/cOUJOiI=",
+        gen="testnet-v1.0", flat_fee=True, min_fee=1000
+    )
+    return (
+        sender, params, load_approval_bytecode(), b"\x06\x81\x01",
+        owner_address, contractor_address, FairLensVerifier().get_public_key_bytes()
+    )
+
+def bench_build_create_txn():
+    inputs = create_txn_inputs()
+
+    def run():
+        build_create_txn(*inputs)
+    return run
+
+def bench_sign_create_txn():
+    private_key, _ = account.generate_account()
+    txn = build_create_txn(*create_txn_inputs())
+
+    def run():
+        txn.sign(private_key)
+    return run
+
+BENCHMARKS = {
+    'create_attestation_message': bench_create_attestation_message,
+    'sign_attestation': bench_sign_attestation,
+    'verify_attestation': bench_verify_attestation,
+    'compile_approval_program': bench_compile_approval_program,
+    'build_create_txn': bench_build_create_txn,
+    'sign_create_txn': bench_sign_create_txn,
+}
+
+# ---------------------------
+# Measurement
+# ---------------------------
+def calibrate(func, min_time):
+    """Find an iteration count whose total runtime is at least min_time seconds."""
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or iterations >= 1_000_000:
+            return iterations
+        iterations *= 10 if elapsed < min_time / 10 else 2
+
+def measure(func, rounds, min_time):
+    """Time func over several rounds and return per-call statistics in microseconds."""
+    func()  # warm-up
+    iterations = calibrate(func, min_time)
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        samples.append((time.perf_counter() - start) / iterations * 1e6)
+
+    median_us = statistics.median(samples)
+    return {
+        'median_us': round(median_us, 3),
+        'min_us': round(min(samples), 3),
+        'mean_us': round(statistics.mean(samples), 3),
+        'stdev_us': round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0,
+        'ops_per_sec': round(1e6 / median_us, 1) if median_us else 0.0,
+        'rounds': rounds,
+        'iterations': iterations,
+    }
+
+def run_benchmarks(names, rounds, min_time):
+    """Run the selected benchmarks and return a JSON-serialisable report."""
+    results = {}
+    for name in names:
+        stats = measure(BENCHMARKS[name](), rounds, min_time)
+        results[name] = stats
+        print(f"  {name:30} {stats['median_us']:>12.3f} µs  ({stats['ops_per_sec']:.1f} ops/s)")
+
+    return {
+        'meta': {
+            'timestamp': int(time.time()),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pyteal': getattr(pyteal, '__version__', 'unknown'),
+        },
+        'benchmarks': results,
+    }
+
+# ---------------------------
+# Baselines
+# ---------------------------
+def save_baseline(report, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📝 Baseline saved to {path}")
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+def compare(report, baseline, threshold):
+    """
+    Compare medians against the baseline.
+    Returns the list of benchmark names that slowed down by more than threshold percent.
+    """
+    regressions = []
+    print(f"\n📊 Comparison against baseline (threshold {threshold:.1f}%)")
+    print("=" * 70)
+
+    for name, stats in report['benchmarks'].items():
+        base = baseline.get('benchmarks', {}).get(name)
+        if not base:
+            print(f"  {name:30} {'(no baseline)':>20}")
+            continue
+
+        if base['median_us'] <= 0:
+            print(f"  {name:30} {'(invalid baseline)':>20}")
+            continue
+
+        change = (stats['median_us'] - base['median_us']) / base['median_us'] * 100
+        regressed = change > threshold
+        status = "❌ REGRESSED" if regressed else "✅ OK"
+        print(f"  {name:30} {base['median_us']:>12.3f} → {stats['median_us']:>12.3f} µs  {change:+7.1f}%  {status}")
+
+        if regressed:
+            regressions.append(name)
+
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="FairLens Python toolchain benchmarks")
+    parser.add_argument('--save', nargs='?', const=DEFAULT_BASELINE, metavar='PATH',
+                        help=f"write results as a baseline (default: {DEFAULT_BASELINE})")
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, metavar='PATH',
+                        help="compare results with a baseline and fail on regressions")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown of the median in percent (default: %(default)s)")
+    parser.add_argument('--rounds', type=int, default=7,
+                        help="timed rounds per benchmark (default: %(default)s)")
+    parser.add_argument('--min-time', type=float, default=0.1,
+                        help="minimum seconds per round (default: %(default)s)")
+    parser.add_argument('--only', action='append', choices=sorted(BENCHMARKS),
+                        help="run only the named benchmark (repeatable)")
+    parser.add_argument('--approval-bin', metavar='PATH',
+                        help="compiled approval bytecode for the transaction benchmarks")
+    args = parser.parse_args()
+
+    global APPROVAL_BIN_PATH
+    APPROVAL_BIN_PATH = args.approval_bin
+
+    print("⏱️  FairLens Benchmark Suite")
+    print("=" * 70)
+
+    names = args.only or list(BENCHMARKS)
+    report = run_benchmarks(names, args.rounds, args.min_time)
+
+    if args.save:
+        save_baseline(report, args.save)
+
+    if args.compare:
+        try:
+            baseline = load_baseline(args.compare)
+        except (OSError, ValueError) as e:
+            print(f"❌ Could not load baseline {args.compare}: {e}")
+            return 1
+
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n⚠️  {len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+            return 1
+        print("\n🎉 No regressions detected")
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,9 +4,13 @@
 import os
 import sys
 import json
-from algosdk import account, mnemonic
+import base64
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from algosdk import account, encoding, mnemonic
 from algosdk.v2client import algod
-from algosdk.transaction import ApplicationCreateTxn, PaymentTxn, wait_for_confirmation, StateSchema
+from algosdk.transaction import ApplicationCreateTxn, ApplicationUpdateTxn, PaymentTxn, wait_for_confirmation, StateSchema
 from algosdk.logic import get_application_address
 import pyteal
 
@@ -110,6 +114,28 @@ def fund_account(address, amount=1000000):
         print(f"   ❌ Error checking balance: {e}")
         return False
 
+def compile_program(algod_client, teal_source):
+    """Assemble TEAL source into AVM bytecode using the node's compile endpoint."""
+    compile_response = algod_client.compile(teal_source)
+    return base64.b64decode(compile_response['result'])
+
+def build_create_txn(sender, params, approval_bytes, clear_bytes, owner_address, contractor_address, verifier_pubkey):
+    """Build the unsigned application creation transaction for a FairLens project."""
+    return ApplicationCreateTxn(
+        sender=sender,
+        sp=params,
+        on_complete=0,  # NoOp
+        approval_program=approval_bytes,
+        clear_program=clear_bytes,
+        global_schema=StateSchema(num_uints=10, num_byte_slices=20),
+        local_schema=StateSchema(num_uints=0, num_byte_slices=0),
+        app_args=[
+            encoding.decode_address(owner_address),
+            encoding.decode_address(contractor_address),
+            verifier_pubkey
+        ]
+    )
+
 def deploy_contract(private_key, owner_address, contractor_address, verifier_pubkey):
     """Deploy the FairLens contract."""
     print("Deploying FairLens contract...")
@@ -121,21 +147,18 @@ def deploy_contract(private_key, owner_address, contractor_address, verifier_pub
         
         # Compile contract
         approval_teal, clear_teal = compile_contract()
+        approval_bytes = compile_program(algod_client, approval_teal)
+        clear_bytes = compile_program(algod_client, clear_teal)
         
         # Create application creation transaction
-        txn = ApplicationCreateTxn(
-            sender=account.address_from_private_key(private_key),
-            sp=params,
-            on_complete=0,  # NoOp
-            approval_program=approval_teal,
-            clear_program=clear_teal,
-            global_schema=StateSchema(num_uints=10, num_byte_slices=20),
-            local_schema=StateSchema(num_uints=0, num_byte_slices=0),
-            app_args=[
-                owner_address.encode('utf-8'),
-                contractor_address.encode('utf-8'),
-                verifier_pubkey
-            ]
+        txn = build_create_txn(
+            account.address_from_private_key(private_key),
+            params,
+            approval_bytes,
+            clear_bytes,
+            owner_address,
+            contractor_address,
+            verifier_pubkey
         )
         
         # Sign and send transaction
@@ -191,8 +214,196 @@ def fund_contract(app_address, private_key, amount=5000000):
         print(f"❌ Error funding contract: {e}")
         return False
 
+def program_digest(program_bytes):
+    """SHA-256 hex digest of program bytecode, used to detect changed contracts."""
+    return hashlib.sha256(program_bytes).hexdigest()
+
+def load_manifest(manifest_path):
+    """
+    Load a deployment manifest.
+    Accepts a single deployment.json object, a list of them, or {"apps": [...]}.
+    Returns (manifest, entries) where entries are the app dicts inside manifest.
+    """
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    if isinstance(manifest, list):
+        entries = manifest
+    elif 'apps' in manifest:
+        entries = manifest['apps']
+    else:
+        entries = [manifest]
+
+    for entry in entries:
+        if 'app_id' not in entry:
+            raise ValueError(f"Manifest entry without app_id: {entry}")
+    return manifest, entries
+
+def fetch_deployed_app(algod_client, app_id):
+    """Return the (approval, clear) bytecode and owner address currently deployed for an app."""
+    params = algod_client.application_info(app_id)['params']
+    owner_address = None
+    for entry in params.get('global-state', []):
+        if base64.b64decode(entry['key']) == b"owner" and entry['value']['type'] == 1:
+            owner_bytes = base64.b64decode(entry['value'].get('bytes', ''))
+            if len(owner_bytes) == 32:
+                owner_address = encoding.encode_address(owner_bytes)
+    return (
+        base64.b64decode(params.get('approval-program', '')),
+        base64.b64decode(params.get('clear-state-program', '')),
+        owner_address
+    )
+
+def plan_upgrades(algod_client, app_ids, approval_bytes, clear_bytes, signer_address, max_workers=8):
+    """
+    Compare local bytecode hashes with every deployed app in parallel.
+    The contract only accepts UpdateApplication from its owner global, so
+    outdated apps owned by another account are reported as failed up front.
+    Returns (outdated, up_to_date, failed) where failed maps app_id -> error.
+    """
+    approval_hash = program_digest(approval_bytes)
+    clear_hash = program_digest(clear_bytes)
+
+    def check(app_id):
+        try:
+            deployed_approval, deployed_clear, owner_address = fetch_deployed_app(algod_client, app_id)
+        except Exception as e:
+            return app_id, None, e
+        changed = (program_digest(deployed_approval) != approval_hash
+                   or program_digest(deployed_clear) != clear_hash)
+        if changed and owner_address != signer_address:
+            return app_id, None, PermissionError(
+                f"signer {signer_address} is not the app owner ({owner_address or 'unknown'})"
+            )
+        return app_id, changed, None
+
+    outdated, up_to_date, failed = [], [], {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for app_id, changed, error in executor.map(check, app_ids):
+            if error is not None:
+                failed[app_id] = error
+            elif changed:
+                outdated.append(app_id)
+            else:
+                up_to_date.append(app_id)
+    return outdated, up_to_date, failed
+
+def build_update_txn(sender, params, app_id, approval_bytes, clear_bytes):
+    """Build the unsigned UpdateApplication transaction for a deployed app."""
+    return ApplicationUpdateTxn(
+        sender=sender,
+        sp=params,
+        index=app_id,
+        approval_program=approval_bytes,
+        clear_program=clear_bytes
+    )
+
+def send_updates(algod_client, private_key, app_ids, approval_bytes, clear_bytes, batch_size=16, max_workers=8):
+    """
+    Send UpdateApplication transactions in batches, submitting and confirming
+    each batch in parallel. Returns (updated, failed) where failed maps app_id -> error.
+    """
+    sender = account.address_from_private_key(private_key)
+    updated, failed = [], {}
+
+    def submit(app_id, params):
+        try:
+            txn = build_update_txn(sender, params, app_id, approval_bytes, clear_bytes)
+            return app_id, algod_client.send_transaction(txn.sign(private_key)), None
+        except Exception as e:
+            return app_id, None, e
+
+    def confirm(app_id, tx_id):
+        try:
+            wait_for_confirmation(algod_client, tx_id, 4)
+            return app_id, None
+        except Exception as e:
+            return app_id, e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for start in range(0, len(app_ids), batch_size):
+            batch = app_ids[start:start + batch_size]
+            params = algod_client.suggested_params()
+
+            sent = []
+            for app_id, tx_id, error in executor.map(lambda app_id: submit(app_id, params), batch):
+                if error is not None:
+                    failed[app_id] = error
+                else:
+                    print(f"   ✓ Update sent for app {app_id}: {tx_id}")
+                    sent.append((app_id, tx_id))
+
+            for app_id, error in executor.map(lambda item: confirm(*item), sent):
+                if error is not None:
+                    failed[app_id] = error
+                else:
+                    updated.append(app_id)
+
+    return updated, failed
+
+def upgrade_contracts(algod_client, private_key, manifest_path, batch_size=16, max_workers=8, dry_run=False):
+    """
+    Upgrade every app in the manifest whose deployed code differs from the
+    locally compiled contract. Apps already running the same bytecode are
+    skipped without any chain writes. Returns True if no app failed.
+    """
+    print(f"Upgrading FairLens contracts listed in {manifest_path}...")
+
+    manifest, entries = load_manifest(manifest_path)
+    approval_teal, clear_teal = compile_contract()
+    approval_bytes = compile_program(algod_client, approval_teal)
+    clear_bytes = compile_program(algod_client, clear_teal)
+    print(f"   Approval hash: {program_digest(approval_bytes)}")
+    print(f"   Clear hash:    {program_digest(clear_bytes)}")
+
+    app_ids = [int(entry['app_id']) for entry in entries]
+    signer_address = account.address_from_private_key(private_key)
+    outdated, up_to_date, failed = plan_upgrades(
+        algod_client, app_ids, approval_bytes, clear_bytes, signer_address, max_workers
+    )
+    print(f"✓ {len(up_to_date)} app(s) up to date, {len(outdated)} app(s) need an update")
+
+    updated = []
+    if outdated and not dry_run:
+        updated, send_failed = send_updates(
+            algod_client, private_key, outdated, approval_bytes, clear_bytes, batch_size, max_workers
+        )
+        failed.update(send_failed)
+
+    for app_id, error in failed.items():
+        print(f"   ❌ App {app_id}: {error}")
+
+    # Record the code each app is known to run
+    current = set(up_to_date) | set(updated)
+    for entry in entries:
+        if int(entry['app_id']) in current:
+            entry['approval_hash'] = program_digest(approval_bytes)
+            entry['clear_hash'] = program_digest(clear_bytes)
+    if not dry_run:
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+    print(f"✓ Updated {len(updated)} app(s), skipped {len(up_to_date)}, failed {len(failed)}")
+    return not failed
+
 def main():
     """Main deployment function."""
+    parser = argparse.ArgumentParser(description="Deploy or upgrade the FairLens contract")
+    parser.add_argument('--upgrade', action='store_true',
+                        help="update deployed apps in place instead of creating a new one")
+    parser.add_argument('--manifest', default='deployment.json',
+                        help="deployment manifest listing app_ids to upgrade (default: %(default)s)")
+    parser.add_argument('--batch-size', type=int, default=16,
+                        help="update transactions submitted per batch (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=8,
+                        help="parallel requests to algod (default: %(default)s)")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="with --upgrade, only report which apps would be updated")
+    args = parser.parse_args()
+
+    if args.upgrade:
+        return upgrade_main(args)
+
     print("🚀 FairLens Contract Deployment Script")
     print("=" * 50)
     
@@ -268,5 +479,28 @@ def main():
     print("\n🔗 View on AlgoExplorer:")
     print(f"   https://testnet.algoexplorer.io/application/{app_id}")
 
+def upgrade_main(args):
+    """Upgrade deployed apps in place from the deployment manifest."""
+    print("🔁 FairLens Contract Upgrade")
+    print("=" * 50)
+
+    # The contract only accepts updates from its owner, so sign with the owner's key
+    owner_mnemonic = os.getenv('OWNER_MNEMONIC')
+    if not owner_mnemonic:
+        print("❌ OWNER_MNEMONIC is required to upgrade contracts")
+        return 1
+
+    try:
+        private_key = mnemonic.to_private_key(owner_mnemonic)
+        ok = upgrade_contracts(
+            get_algod_client(), private_key, args.manifest,
+            batch_size=args.batch_size, max_workers=args.workers, dry_run=args.dry_run
+        )
+    except Exception as e:
+        print(f"❌ Error upgrading contracts: {e}")
+        return 1
+
+    return 0 if ok else 1
+
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+# scripts/load_generator.py
+# End-to-end milestone lifecycle load generator for FairLens
+# Simulates projects arriving at a target rate (open-loop) and driving each one
+# through create -> fund -> add_ms -> submit_proof -> verify_release with real
+# FairLensVerifier attestations, then reports throughput and p50/p95/p99
+# latency per stage.
+#
+# Usage:
+#   python scripts/load_generator.py --projects 200 --rate 20 --milestones 3
+#   python scripts/load_generator.py --round-time 0.5 --json load_report.json
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Add backend and scripts directories to path
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(os.path.join(ROOT_DIR, 'backend'))
+sys.path.append(os.path.dirname(__file__))
+
+try:
+    from algosdk import account
+    from algosdk.logic import get_application_address
+    from algosdk.transaction import ApplicationNoOpTxn, PaymentTxn, wait_for_confirmation
+    from algosdk.v2client import algod
+    from verifier_sign import FairLensVerifier
+    from deploy_testnet import build_create_txn, compile_contract, compile_program
+    from release_preflight import RELEASE_GROUP_SIZE, build_release_group
+    from local_algod import (
+        LocalLedger, LocalAlgodClient, FAUCET_ADDRESS, FAUCET_PRIVATE_KEY, program_hash_bytes,
+        MIN_BALANCE, MIN_FEE, APP_PAGE_MIN_BALANCE, SCHEMA_UINT_MIN_BALANCE, SCHEMA_BYTES_MIN_BALANCE,
+    )
+except ImportError as e:
+    print(f"Error importing load generator dependencies: {e}")
+    print("Please install them with: pip install -r backend/requirements.txt")
+    sys.exit(1)
+
+STAGES = ['create', 'fund', 'add_ms', 'submit_proof', 'verify_release']
+MILESTONE_AMOUNT = 100000  # microALGOs released per milestone
+WAIT_ROUNDS = 10
+
+# The 10-uint global schema holds total_ms, cur_ms, escrow plus m{i}_amt and m{i}_due per milestone
+MAX_MILESTONES = (10 - 3) // 2
+
+# Creator min balance for the (10 uint, 20 byte-slice) global schema used by build_create_txn
+APP_CREATE_MIN_BALANCE = APP_PAGE_MIN_BALANCE + 10 * SCHEMA_UINT_MIN_BALANCE + 20 * SCHEMA_BYTES_MIN_BALANCE
+
+
+class StageRecorder:
+    """Thread-safe collection of per-stage latencies, errors and completion times."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {stage: [] for stage in ['queue'] + STAGES}
+        self.completions = {stage: [] for stage in STAGES}
+        self.errors = {stage: [] for stage in STAGES}
+        self.project_completions = []
+
+    def record(self, stage, started, finished):
+        with self._lock:
+            self.latencies[stage].append(finished - started)
+            if stage in self.completions:
+                self.completions[stage].append(finished)
+
+    def record_error(self, stage, exc):
+        with self._lock:
+            self.errors[stage].append(str(exc))
+
+    def project_done(self):
+        with self._lock:
+            self.project_completions.append(time.perf_counter())
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def window_rate(timestamps):
+    """Completions per second between the first and last completion, ignoring ramp-up and drain."""
+    if len(timestamps) < 2:
+        return 0.0
+    span = max(timestamps) - min(timestamps)
+    return (len(timestamps) - 1) / span if span else 0.0
+
+
+def submit_and_wait(algod_client, txn, private_key):
+    """Sign, send and wait for a transaction; returns the confirmed transaction info."""
+    tx_id = algod_client.send_transaction(txn.sign(private_key))
+    return wait_for_confirmation(algod_client, tx_id, WAIT_ROUNDS)
+
+
+def submit_group_and_wait(algod_client, txns, private_key):
+    """Sign and send an atomic group, then wait for its first transaction."""
+    tx_id = algod_client.send_transactions([txn.sign(private_key) for txn in txns])
+    return wait_for_confirmation(algod_client, tx_id, WAIT_ROUNDS)
+
+
+def make_projects(count, milestones):
+    """Generate owner/contractor accounts and a verifier for every simulated project."""
+    projects = []
+    for index in range(count):
+        owner_key, owner_address = account.generate_account()
+        contractor_key, contractor_address = account.generate_account()
+        projects.append({
+            'index': index,
+            'owner_key': owner_key,
+            'owner_address': owner_address,
+            'contractor_key': contractor_key,
+            'contractor_address': contractor_address,
+            'verifier': FairLensVerifier(),
+            'milestones': milestones,
+        })
+    return projects
+
+
+def fund_accounts(algod_client, projects):
+    """Fund every project account from the stand-in faucet before the timed run."""
+    print(f"Funding {len(projects) * 2} project accounts from the faucet...")
+    tx_ids = []
+    for project in projects:
+        escrow = project['milestones'] * (MILESTONE_AMOUNT + MIN_FEE) + MIN_BALANCE
+        owner_amount = MIN_BALANCE + APP_CREATE_MIN_BALANCE + escrow + (2 + project['milestones']) * MIN_FEE
+        contractor_amount = MIN_BALANCE + (1 + RELEASE_GROUP_SIZE) * project['milestones'] * MIN_FEE
+        for receiver, amount in ((project['owner_address'], owner_amount),
+                                 (project['contractor_address'], contractor_amount)):
+            params = algod_client.suggested_params()
+            txn = PaymentTxn(sender=FAUCET_ADDRESS, sp=params, receiver=receiver, amt=amount)
+            tx_ids.append(algod_client.send_transaction(txn.sign(FAUCET_PRIVATE_KEY)))
+
+    for tx_id in tx_ids:
+        wait_for_confirmation(algod_client, tx_id, WAIT_ROUNDS)
+    print("✓ Project accounts funded")
+
+
+def run_project(algod_client, project, programs, scheduled_at, recorder):
+    """Drive one project through the full milestone lifecycle, timing every stage."""
+    approval_bytes, clear_bytes = programs
+    approval_hash = program_hash_bytes(approval_bytes)
+    owner_key, contractor_key = project['owner_key'], project['contractor_key']
+    milestones = project['milestones']
+    verifier = project['verifier']
+
+    stage = 'create'
+    started = time.perf_counter()
+    recorder.record('queue', scheduled_at, started)
+    try:
+        # Queueing before this point is reported separately as the 'queue' stage
+        txn = build_create_txn(
+            project['owner_address'], algod_client.suggested_params(),
+            approval_bytes, clear_bytes,
+            project['owner_address'], project['contractor_address'],
+            verifier.get_public_key_bytes()
+        )
+        app_id = submit_and_wait(algod_client, txn, owner_key)['application-index']
+        recorder.record(stage, started, time.perf_counter())
+
+        stage = 'fund'
+        started = time.perf_counter()
+        txn = PaymentTxn(
+            sender=project['owner_address'], sp=algod_client.suggested_params(),
+            receiver=get_application_address(app_id),
+            amt=milestones * (MILESTONE_AMOUNT + MIN_FEE) + MIN_BALANCE
+        )
+        submit_and_wait(algod_client, txn, owner_key)
+        recorder.record(stage, started, time.perf_counter())
+
+        for index in range(milestones):
+            stage = 'add_ms'
+            started = time.perf_counter()
+            txn = ApplicationNoOpTxn(
+                project['owner_address'], algod_client.suggested_params(), app_id,
+                [b"add_ms", index, MILESTONE_AMOUNT, int(time.time()) + 86400, f"QmMilestone{app_id}x{index}".encode()]
+            )
+            submit_and_wait(algod_client, txn, owner_key)
+            recorder.record(stage, started, time.perf_counter())
+
+        for index in range(milestones):
+            proof_hash = f"QmProof{app_id}x{index}"
+
+            stage = 'submit_proof'
+            started = time.perf_counter()
+            txn = ApplicationNoOpTxn(
+                project['contractor_address'], algod_client.suggested_params(), app_id,
+                [b"submit_proof", index, proof_hash.encode()]
+            )
+            submit_and_wait(algod_client, txn, contractor_key)
+            recorder.record(stage, started, time.perf_counter())
+
+            stage = 'verify_release'
+            started = time.perf_counter()
+            message, signature = verifier.sign_attestation(
+                app_id, index, "PASS", f"QmMilestone{app_id}x{index}", proof_hash,
+                program_hash=approval_hash
+            )
+            # Padded with get_state calls for ed25519verify's opcode budget, as release_preflight sends it
+            group = build_release_group(
+                project['contractor_address'], algod_client.suggested_params(), app_id, index, message, signature
+            )
+            submit_group_and_wait(algod_client, group, contractor_key)
+            recorder.record(stage, started, time.perf_counter())
+
+        recorder.project_done()
+    except Exception as e:
+        recorder.record_error(stage, e)
+
+
+def arrival_offsets(count, rate, arrival, seed):
+    """Open-loop arrival schedule (seconds from start) independent of completions."""
+    rng = random.Random(seed)
+    offsets, t = [], 0.0
+    for _ in range(count):
+        offsets.append(t)
+        t += rng.expovariate(rate) if arrival == 'poisson' else 1.0 / rate
+    return offsets
+
+
+def run_load(algod_client, projects, programs, rate, arrival, seed, max_inflight):
+    """Release projects on schedule and wait for all lifecycles to finish."""
+    recorder = StageRecorder()
+    offsets = arrival_offsets(len(projects), rate, arrival, seed)
+
+    with ThreadPoolExecutor(max_workers=max_inflight) as executor:
+        start = time.perf_counter()
+        for project, offset in zip(projects, offsets):
+            scheduled_at = start + offset
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(run_project, algod_client, project, programs, scheduled_at, recorder)
+        last_arrival = time.perf_counter() - start
+
+    duration = time.perf_counter() - start
+    return recorder, duration, last_arrival
+
+
+def build_report(recorder, duration, last_arrival, args):
+    stages = {}
+    for stage, latencies in recorder.latencies.items():
+        values = sorted(latencies)
+        completions = recorder.completions.get(stage)
+        stages[stage] = {
+            'count': len(values),
+            'errors': len(recorder.errors.get(stage, [])),
+            'throughput_per_sec': round(window_rate(completions), 2) if completions is not None else None,
+            'p50_ms': round(percentile(values, 50) * 1000, 2),
+            'p95_ms': round(percentile(values, 95) * 1000, 2),
+            'p99_ms': round(percentile(values, 99) * 1000, 2),
+            'max_ms': round(values[-1] * 1000, 2) if values else 0.0,
+        }
+
+    offered_rate = (args.projects - 1) / last_arrival if last_arrival else float(args.rate)
+    completed_rate = window_rate(recorder.project_completions)
+    return {
+        'config': {
+            'projects': args.projects,
+            'target_rate': args.rate,
+            'arrival': args.arrival,
+            'milestones': args.milestones,
+            'round_time': args.round_time,
+            'max_inflight': args.max_inflight,
+        },
+        'duration_sec': round(duration, 3),
+        'offered_projects_per_sec': round(offered_rate, 2),
+        'completed_projects': len(recorder.project_completions),
+        'completed_projects_per_sec': round(completed_rate, 2),
+        'releases_per_sec': stages['verify_release']['throughput_per_sec'],
+        'stages': stages,
+        'errors': {stage: errors[:5] for stage, errors in recorder.errors.items() if errors},
+    }
+
+
+def print_report(report):
+    print("\n📊 Load Test Results")
+    print("=" * 86)
+    print(f"Duration: {report['duration_sec']:.2f}s   "
+          f"Offered: {report['offered_projects_per_sec']:.2f} projects/s   "
+          f"Completed: {report['completed_projects']} ({report['completed_projects_per_sec']:.2f}/s)   "
+          f"Releases: {report['releases_per_sec']:.2f}/s")
+    print()
+    print(f"{'Stage':16} {'Count':>7} {'Errors':>7} {'Thru/s':>9} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10}")
+    for stage, stats in report['stages'].items():
+        throughput = '-' if stats['throughput_per_sec'] is None else f"{stats['throughput_per_sec']:.2f}"
+        print(f"{stage:16} {stats['count']:>7} {stats['errors']:>7} {throughput:>9} "
+              f"{stats['p50_ms']:>10.2f} {stats['p95_ms']:>10.2f} {stats['p99_ms']:>10.2f} {stats['max_ms']:>10.2f}")
+
+    for stage, errors in report['errors'].items():
+        print(f"\n❌ {stage} errors (first {len(errors)}):")
+        for message in errors:
+            print(f"   {message}")
+
+    # Failed projects are not a capacity signal; report them instead of blaming a stage
+    if report['errors']:
+        print(f"\n❌ {report['config']['projects'] - report['completed_projects']} project(s) failed; see errors above")
+    # Completion rate falling behind the offered rate means work is queueing up
+    elif report['completed_projects_per_sec'] < 0.9 * report['offered_projects_per_sec']:
+        slowest = max(['queue'] + STAGES, key=lambda stage: report['stages'][stage]['p99_ms'])
+        print(f"\n⚠️  Pipeline saturated: completions lag the offered rate; highest p99 in '{slowest}'")
+    else:
+        print("\n✅ Pipeline kept up with the offered rate")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FairLens milestone lifecycle load generator")
+    parser.add_argument('--projects', type=int, default=50, help="number of simulated projects (default: %(default)s)")
+    parser.add_argument('--rate', type=float, default=10.0, help="target project arrivals per second (default: %(default)s)")
+    parser.add_argument('--arrival', choices=['poisson', 'uniform'], default='poisson',
+                        help="inter-arrival distribution (default: %(default)s)")
+    parser.add_argument('--milestones', type=int, default=3,
+                        help=f"milestones per project, at most {MAX_MILESTONES} (default: %(default)s)")
+    parser.add_argument('--round-time', type=float, default=0.0,
+                        help="seconds between stand-in blocks, 0 for a block per submission (default: %(default)s)")
+    parser.add_argument('--max-inflight', type=int, default=256,
+                        help="maximum concurrently running project lifecycles (default: %(default)s)")
+    parser.add_argument('--algod-address',
+                        help="run against a stand-in server (scripts/local_algod.py) instead of an in-process ledger")
+    parser.add_argument('--algod-token', default='', help="API token for --algod-address")
+    parser.add_argument('--seed', type=int, default=1, help="arrival schedule seed (default: %(default)s)")
+    parser.add_argument('--json', metavar='PATH', help="also write the report as JSON")
+    args = parser.parse_args()
+    if args.projects < 1:
+        parser.error("--projects must be at least 1")
+    if not args.rate > 0:
+        parser.error("--rate must be greater than 0")
+    if args.max_inflight < 1:
+        parser.error("--max-inflight must be at least 1")
+    if not 1 <= args.milestones <= MAX_MILESTONES:
+        parser.error(f"--milestones must be between 1 and {MAX_MILESTONES}: the contract's global schema has no room for more")
+
+    print("🚦 FairLens Lifecycle Load Generator")
+    print("=" * 50)
+
+    if args.algod_address:
+        # The server's faucet funds the project accounts and sets the round cadence
+        ledger = None
+        algod_client = algod.AlgodClient(args.algod_token, args.algod_address)
+    else:
+        ledger = LocalLedger(round_time=args.round_time).start()
+        algod_client = LocalAlgodClient(ledger)
+    try:
+        approval_teal, clear_teal = compile_contract()
+        programs = (compile_program(algod_client, approval_teal), compile_program(algod_client, clear_teal))
+
+        projects = make_projects(args.projects, args.milestones)
+        fund_accounts(algod_client, projects)
+
+        print(f"Running {args.projects} projects at {args.rate}/s ({args.arrival} arrivals)...")
+        recorder, duration, last_arrival = run_load(
+            algod_client, projects, programs, args.rate, args.arrival, args.seed, args.max_inflight
+        )
+    finally:
+        if ledger is not None:
+            ledger.stop()
+
+    report = build_report(recorder, duration, last_arrival, args)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📝 Report saved to {args.json}")
+
+    return 1 if report['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,961 @@
+#!/usr/bin/env python3
+# scripts/local_algod.py
+# Local algod stand-in for offline testing and load generation
+# Implements the subset of the algod v2 REST API used by the FairLens scripts
+# (params, raw transaction submission, simulate, pending transaction info,
+# status, wait-for-block, account/application info, TEAL compile) on top of an
+# in-memory ledger that executes the FairLens approval logic natively.
+# Can be used in-process (LocalAlgodClient) or served over HTTP, where it can
+# also record a real node's responses, replay them, and inject latency/errors.
+#
+# Usage:
+#   python scripts/local_algod.py --port 4001 --round-time 1
+#   python scripts/local_algod.py --mode record --upstream https://testnet-api.4160.nodely.dev
+#   python scripts/local_algod.py --mode replay --replay-file algod_replay.jsonl --latency-ms 50
+#
+# The stand-in does not evaluate TEAL. Every application behaves like
+# contracts/fairlens_app.py; Ed25519Verify follows the AVM and checks the
+# signature over "ProgData" || program hash || data, so attestations must be
+# signed for the app's approval program (FairLensVerifier's program_hash).
+# Opcode budget is pooled per group as on the AVM (700 per app call), so a
+# lone verify_release call fails here just as it does on TestNet.
+
+import os
+import re
+import sys
+import json
+import time
+import base64
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib import parse, request
+from urllib.error import HTTPError, URLError
+
+import msgpack
+from nacl.signing import SigningKey, VerifyKey
+from nacl.exceptions import BadSignatureError
+from algosdk import account, constants, encoding, error, mnemonic
+from algosdk.logic import get_application_address
+from algosdk.transaction import SignedTransaction
+from algosdk.v2client import algod
+
+GENESIS_ID = "fairlens-local-v1"
+GENESIS_HASH = base64.b64encode(hashlib.sha256(GENESIS_ID.encode()).digest()).decode()
+CONSENSUS_VERSION = "fairlens-local"
+MIN_FEE = 1000
+MIN_BALANCE = 100000
+APP_PAGE_MIN_BALANCE = 100000
+SCHEMA_UINT_MIN_BALANCE = 28500
+SCHEMA_BYTES_MIN_BALANCE = 50000
+FIRST_APP_ID = 1001
+
+# Opcode budget each top-level app call adds to its group's pool
+APP_CALL_BUDGET = 700
+# Cost of each path through contracts/fairlens_app.py compiled for TEAL v6,
+# counting ed25519verify at 1900
+PATH_COSTS = {
+    'create': 30, 'update': 19, 'delete': 15,
+    b"add_ms": 79, b"submit_proof": 54, b"verify_release": 2001, b"set_verifier": 52,
+    b"set_contractor": 56, b"fund_escrow": 57, b"get_state": 52,
+}
+
+# Well-known faucet account holding the genesis supply
+FAUCET_SUPPLY = 10 ** 15
+
+# OnComplete values
+NOOP, OPT_IN, CLOSE_OUT, CLEAR_STATE, UPDATE_APPLICATION, DELETE_APPLICATION = range(6)
+
+
+def _faucet_key():
+    """Derive the faucet's algosdk private key from its fixed seed."""
+    seed = hashlib.sha256(b"fairlens-local-algod-faucet").digest()
+    signing_key = SigningKey(seed)
+    return base64.b64encode(seed + signing_key.verify_key.encode()).decode()
+
+
+FAUCET_PRIVATE_KEY = _faucet_key()
+FAUCET_ADDRESS = account.address_from_private_key(FAUCET_PRIVATE_KEY)
+
+
+class LogicError(Exception):
+    """Raised when a transaction fails evaluation; rolls back its group."""
+
+
+def itob(value):
+    return value.to_bytes(8, 'big')
+
+
+def btoi(value):
+    if len(value) > 8:
+        raise LogicError("btoi arg too long")
+    return int.from_bytes(value, 'big')
+
+
+def program_hash_bytes(program):
+    """SHA-512/256 of "Program" || program, the hash ed25519verify signs over."""
+    return encoding.checksum(b"Program" + program)
+
+
+def program_hash(program):
+    """Return the address-style hash algod reports for compiled programs."""
+    return encoding.encode_address(program_hash_bytes(program))
+
+
+class LocalLedger:
+    """
+    In-memory Algorand ledger with a FairLens application evaluator.
+
+    Transactions are checked (signature, genesis, validity window, fee) when
+    submitted and evaluated when the next block is assembled. Blocks are
+    produced every round_time seconds by a background thread, or immediately
+    after each submission when round_time is 0 (like algod's dev mode).
+    """
+
+    def __init__(self, round_time=0.0, verify_signatures=True):
+        self.round_time = round_time
+        self.verify_signatures = verify_signatures
+
+        self.last_round = 1
+        self.last_round_time = time.monotonic()
+        self.balances = {FAUCET_ADDRESS: FAUCET_SUPPLY}
+        self.created_apps = {}  # address -> set of app ids
+        self.apps = {}
+        self.next_app_id = FIRST_APP_ID
+
+        self.pending = []  # list of (txids, signed transactions)
+        self.pending_ids = set()
+        self.results = {}  # txid -> pending transaction info
+
+        self._lock = threading.Lock()
+        self._round_cond = threading.Condition(self._lock)
+        self._journal = None
+        self._budget = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._routes = [
+            ('GET', re.compile(r'^/transactions/params$'), self._get_params),
+            ('POST', re.compile(r'^/transactions$'), self._post_transactions),
+            ('GET', re.compile(r'^/transactions/pending/(\w+)$'), self._get_pending),
+            ('GET', re.compile(r'^/status$'), self._get_status),
+            ('GET', re.compile(r'^/status/wait-for-block-after/(\d+)$'), self._get_status_after),
+            ('GET', re.compile(r'^/accounts/(\w+)$'), self._get_account),
+            ('GET', re.compile(r'^/applications/(\d+)$'), self._get_application),
+            ('POST', re.compile(r'^/transactions/simulate$'), self._post_simulate),
+            ('POST', re.compile(r'^/teal/compile$'), self._post_compile),
+        ]
+
+    # ---------------------------
+    # Lifecycle
+    # ---------------------------
+    def start(self):
+        """Start producing blocks on the configured cadence."""
+        if self.round_time > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._round_loop, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _round_loop(self):
+        while not self._stop.wait(self.round_time):
+            with self._lock:
+                self._assemble_block()
+
+    # ---------------------------
+    # REST routing
+    # ---------------------------
+    def handle(self, method, path, query=None, body=None):
+        """
+        Dispatch an algod v2 request (path without the /v2 prefix).
+        Returns (status_code, json_payload).
+        """
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(path)
+            if match and route_method == method:
+                try:
+                    return 200, handler(*match.groups(), query=query or {}, body=body)
+                except error.AlgodHTTPError as e:
+                    return e.code, {'message': str(e)}
+        return 404, {'message': f"unknown endpoint {method} {path}"}
+
+    def _get_params(self, query, body):
+        with self._lock:
+            return {
+                'consensus-version': CONSENSUS_VERSION,
+                'fee': 0,
+                'genesis-hash': GENESIS_HASH,
+                'genesis-id': GENESIS_ID,
+                'last-round': self.last_round,
+                'min-fee': MIN_FEE,
+            }
+
+    def _post_transactions(self, query, body):
+        try:
+            unpacker = msgpack.Unpacker(raw=False, strict_map_key=False)
+            unpacker.feed(body or b"")
+            group = [encoding.msgpack_decode(obj) for obj in unpacker]
+        except (ValueError, TypeError, KeyError, AttributeError, msgpack.UnpackException) as e:
+            raise error.AlgodHTTPError(f"invalid transaction encoding: {e}", 400)
+        if not group:
+            raise error.AlgodHTTPError("empty transaction group", 400)
+
+        with self._lock:
+            txids = [self._check_signed(stxn) for stxn in group]
+            self.pending.append((txids, group))
+            self.pending_ids.update(txids)
+            if self.round_time <= 0:
+                self._assemble_block()
+        return {'txId': txids[0]}
+
+    def _post_simulate(self, query, body):
+        try:
+            request = msgpack.unpackb(body or b"", raw=False, strict_map_key=False)
+            txn_groups = [[encoding.msgpack_decode(obj) for obj in txn_group.get('txns', [])]
+                          for txn_group in request.get('txn-groups', [])]
+        except (ValueError, TypeError, AttributeError, msgpack.UnpackException) as e:
+            raise error.AlgodHTTPError(f"invalid simulate request: {e}", 400)
+
+        results = []
+        with self._lock:
+            for group in txn_groups:
+                result = {'txn-results': []}
+                try:
+                    for stxn in group:
+                        self._check_signed(stxn)
+                    infos = self._evaluate_group(group, commit=False)
+                    result['txn-results'] = [{'txn-result': info} for info in infos]
+                except (LogicError, error.AlgodHTTPError) as e:
+                    result['failure-message'] = str(e)
+                results.append(result)
+            return {'version': 2, 'last-round': self.last_round, 'txn-groups': results}
+
+    def _get_pending(self, txid, query, body):
+        with self._lock:
+            if txid in self.results:
+                return self.results[txid]
+            if txid in self.pending_ids:
+                return {'pool-error': '', 'confirmed-round': 0}
+        raise error.AlgodHTTPError("txn does not exist", 404)
+
+    def _status_payload(self):
+        return {
+            'last-round': self.last_round,
+            'last-version': CONSENSUS_VERSION,
+            'next-version': CONSENSUS_VERSION,
+            'next-version-round': self.last_round + 1,
+            'next-version-supported': True,
+            'time-since-last-round': int((time.monotonic() - self.last_round_time) * 1e9),
+            'catchup-time': 0,
+            'stopped-at-unsupported-round': False,
+        }
+
+    def _get_status(self, query, body):
+        with self._lock:
+            return self._status_payload()
+
+    def _get_status_after(self, round_num, query, body):
+        # Like algod, give up after a minute and report the current status
+        deadline = time.monotonic() + 60
+        with self._round_cond:
+            while self.last_round <= int(round_num) and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._round_cond.wait(remaining)
+            return self._status_payload()
+
+    def _get_account(self, address, query, body):
+        if not encoding.is_valid_address(address):
+            raise error.AlgodHTTPError("failed to parse the address", 400)
+        with self._lock:
+            created = sorted(self.created_apps.get(address, ()))
+            return {
+                'address': address,
+                'amount': self.balances.get(address, 0),
+                'amount-without-pending-rewards': self.balances.get(address, 0),
+                'min-balance': self._min_balance(address),
+                'pending-rewards': 0,
+                'rewards': 0,
+                'round': self.last_round,
+                'status': 'Offline',
+                'total-apps-opted-in': 0,
+                'total-created-apps': len(created),
+                'created-apps': [self._app_payload(app_id) for app_id in created],
+            }
+
+    def _get_application(self, app_id, query, body):
+        with self._lock:
+            if int(app_id) not in self.apps:
+                raise error.AlgodHTTPError("application does not exist", 404)
+            return self._app_payload(int(app_id))
+
+    def _post_compile(self, query, body):
+        # No assembler here: the TEAL source itself stands in for the bytecode,
+        # which keeps program hashes content-addressed.
+        program = body or b""
+        return {
+            'hash': program_hash(program),
+            'result': base64.b64encode(program).decode(),
+        }
+
+    def _app_payload(self, app_id):
+        app = self.apps[app_id]
+        global_state = []
+        for key, value in app['global'].items():
+            if isinstance(value, int):
+                state_value = {'type': 2, 'uint': value, 'bytes': ''}
+            else:
+                state_value = {'type': 1, 'uint': 0, 'bytes': base64.b64encode(value).decode()}
+            global_state.append({'key': base64.b64encode(key).decode(), 'value': state_value})
+
+        return {
+            'id': app_id,
+            'params': {
+                'creator': app['creator'],
+                'approval-program': base64.b64encode(app['approval']).decode(),
+                'clear-state-program': base64.b64encode(app['clear']).decode(),
+                'global-state': global_state,
+                'global-state-schema': {'num-uint': app['global_schema'][0], 'num-byte-slice': app['global_schema'][1]},
+                'local-state-schema': {'num-uint': app['local_schema'][0], 'num-byte-slice': app['local_schema'][1]},
+            },
+        }
+
+    # ---------------------------
+    # Submission checks
+    # ---------------------------
+    def _check_signed(self, stxn):
+        if not isinstance(stxn, SignedTransaction):
+            raise error.AlgodHTTPError("only single-signature transactions are supported", 400)
+
+        txn = stxn.transaction
+        txid = txn.get_txid()
+        if txid in self.pending_ids or txid in self.results:
+            raise error.AlgodHTTPError(f"transaction already in ledger: {txid}", 400)
+        if txn.genesis_hash != GENESIS_HASH:
+            raise error.AlgodHTTPError("transaction genesis hash does not match", 400)
+        if not txn.first_valid_round <= self.last_round + 1 <= txn.last_valid_round:
+            raise error.AlgodHTTPError(
+                f"txn dead: round {self.last_round + 1} outside of {txn.first_valid_round}--{txn.last_valid_round}", 400
+            )
+        if txn.fee < MIN_FEE:
+            raise error.AlgodHTTPError(f"transaction had fee {txn.fee}, which is less than the minimum {MIN_FEE}", 400)
+
+        if self.verify_signatures:
+            signer = stxn.authorizing_address or txn.sender
+            message = constants.txid_prefix + base64.b64decode(encoding.msgpack_encode(txn))
+            try:
+                VerifyKey(encoding.decode_address(signer)).verify(message, base64.b64decode(stxn.signature))
+            except (BadSignatureError, ValueError, TypeError):
+                raise error.AlgodHTTPError(f"transaction {txid}: invalid signature", 400)
+        return txid
+
+    # ---------------------------
+    # Block assembly and evaluation
+    # ---------------------------
+    def _assemble_block(self):
+        """Evaluate all pending groups into the next round. Caller holds the lock."""
+        pending, self.pending = self.pending, []
+        next_round = self.last_round + 1
+
+        for txids, group in pending:
+            try:
+                infos = self._evaluate_group(group)
+            except LogicError as e:
+                for txid in txids:
+                    self.results[txid] = {'pool-error': f"transaction rejected: {e}", 'confirmed-round': 0}
+            else:
+                for txid, info in zip(txids, infos):
+                    info.update({'pool-error': '', 'confirmed-round': next_round})
+                    self.results[txid] = info
+            finally:
+                self.pending_ids.difference_update(txids)
+
+        self.last_round = next_round
+        self.last_round_time = time.monotonic()
+        self._round_cond.notify_all()
+
+    def _evaluate_group(self, group, commit=True):
+        """
+        Apply a transaction group atomically and return per-transaction info.
+        Rolls back and raises LogicError on failure; also rolls back on success
+        when commit is False. Caller holds the lock.
+        """
+        self._journal = []
+        self._budget = APP_CALL_BUDGET * sum(1 for stxn in group if stxn.transaction.type == constants.appcall_txn)
+        try:
+            infos = [self._apply(stxn.transaction) for stxn in group]
+            for address in self._touched_accounts():
+                self._check_min_balance(address)
+            if not commit:
+                self._rollback()
+            return infos
+        except LogicError:
+            self._rollback()
+            raise
+        finally:
+            self._journal = None
+
+    def _charge(self, cost):
+        """Spend opcode budget from the group's pool."""
+        self._budget -= cost
+        if self._budget < 0:
+            raise LogicError(f"logic eval error: dynamic cost budget exceeded, group pools "
+                             f"{APP_CALL_BUDGET} per app call")
+
+    def _rollback(self):
+        for undo in reversed(self._journal):
+            undo()
+
+    def _touched_accounts(self):
+        return {entry.address for entry in self._journal if hasattr(entry, 'address')}
+
+    def _set_balance(self, address, amount):
+        previous = self.balances.get(address)
+
+        def undo():
+            if previous is None:
+                self.balances.pop(address, None)
+            else:
+                self.balances[address] = previous
+        undo.address = address
+        self._journal.append(undo)
+        self.balances[address] = amount
+
+    def _debit(self, address, amount):
+        balance = self.balances.get(address, 0)
+        if balance < amount:
+            raise LogicError(f"account {address} balance {balance} below {amount}")
+        self._set_balance(address, balance - amount)
+
+    def _credit(self, address, amount):
+        self._set_balance(address, self.balances.get(address, 0) + amount)
+
+    def _min_balance(self, address):
+        total = MIN_BALANCE
+        for app_id in self.created_apps.get(address, ()):
+            uints, byte_slices = self.apps[app_id]['global_schema']
+            total += APP_PAGE_MIN_BALANCE + uints * SCHEMA_UINT_MIN_BALANCE + byte_slices * SCHEMA_BYTES_MIN_BALANCE
+        return total
+
+    def _check_min_balance(self, address):
+        balance = self.balances.get(address, 0)
+        required = self._min_balance(address)
+        if 0 < balance < required or (balance == 0 and self.created_apps.get(address)):
+            raise LogicError(f"account {address} balance {balance} below min {required}")
+
+    def _apply(self, txn):
+        self._debit(txn.sender, txn.fee)
+        if txn.type == constants.payment_txn:
+            self._debit(txn.sender, txn.amt)
+            self._credit(txn.receiver, txn.amt)
+            return {}
+        if txn.type == constants.appcall_txn:
+            return self._apply_app_call(txn)
+        raise LogicError(f"unsupported transaction type {txn.type}")
+
+    # ---------------------------
+    # FairLens application logic (mirrors contracts/fairlens_app.py)
+    # ---------------------------
+    def _apply_app_call(self, txn):
+        args = list(txn.app_args or [])
+        sender = encoding.decode_address(txn.sender)
+
+        if not txn.index:
+            return self._app_create(txn, args)
+
+        app = self.apps.get(txn.index)
+        if app is None:
+            raise LogicError(f"application {txn.index} does not exist")
+        state = app['global']
+
+        def get(key):
+            return state.get(key, 0)
+
+        def put(key, value):
+            previous = state.get(key)
+            self._journal.append(lambda: state.__setitem__(key, previous) if previous is not None else state.pop(key, None))
+            state[key] = value
+
+        def require(condition, reason):
+            if not condition:
+                raise LogicError(f"logic eval error: {reason}")
+
+        on_complete = txn.on_complete
+        if on_complete == DELETE_APPLICATION:
+            self._charge(PATH_COSTS['delete'])
+            require(sender == get(b"owner"), "sender is not owner")
+            self._delete_app(txn.index)
+            return {}
+        if on_complete == UPDATE_APPLICATION:
+            self._charge(PATH_COSTS['update'])
+            require(sender == get(b"owner"), "sender is not owner")
+            self._set_programs(txn.index, txn.approval_program or b"", txn.clear_program or b"")
+            return {}
+        require(on_complete == NOOP, "on-completion rejected")
+        require(len(args) > 0, "invalid ApplicationArgs index 0")
+
+        method = args[0]
+        info = {}
+        self._charge(PATH_COSTS.get(method, 0))
+        if method == b"add_ms":
+            require(sender == get(b"owner"), "sender is not owner")
+            require(len(args) == 5, "add_ms expects 5 args")
+            index, amount = btoi(args[1]), btoi(args[2])
+            put(b"m" + itob(index) + b"_amt", amount)
+            put(b"m" + itob(index) + b"_due", btoi(args[3]))
+            put(b"m" + itob(index) + b"_hash", args[4])
+            if index >= get(b"total_ms"):
+                put(b"total_ms", index + 1)
+            put(b"escrow", get(b"escrow") + amount)
+        elif method == b"submit_proof":
+            require(sender == get(b"contractor"), "sender is not contractor")
+            require(len(args) == 3, "submit_proof expects 3 args")
+            require(btoi(args[1]) == get(b"cur_ms"), "not the current milestone")
+            put(b"proof_" + itob(btoi(args[1])), args[2])
+        elif method == b"verify_release":
+            require(len(args) == 4, "verify_release expects 4 args")
+            index = btoi(args[1])
+            require(index == get(b"cur_ms"), "not the current milestone")
+            amount = get(b"m" + itob(index) + b"_amt")
+            proof = state.get(b"proof_" + itob(index))
+            require(isinstance(proof, bytes), "proof missing")
+            require(proof != b"", "proof empty")
+            require(self._ed25519_verify(app['approval'], args[2], args[3], get(b"verifier_pk")), "ed25519verify failed")
+
+            # Inner payment, fee covered by pooled outer fee or by the app account
+            app_address = get_application_address(txn.index)
+            inner_fee = max(0, MIN_FEE - (txn.fee - MIN_FEE))
+            receiver = get(b"contractor")
+            require(isinstance(receiver, bytes) and len(receiver) == 32, "invalid receiver")
+            self._debit(app_address, amount + inner_fee)
+            self._credit(encoding.encode_address(receiver), amount)
+
+            put(b"cur_ms", get(b"cur_ms") + 1)
+            require(get(b"escrow") >= amount, "escrow underflow")
+            put(b"escrow", get(b"escrow") - amount)
+            info['inner-txns'] = [{'txn': {'txn': {
+                'type': 'pay', 'snd': app_address,
+                'rcv': encoding.encode_address(receiver), 'amt': amount, 'fee': inner_fee,
+            }}}]
+        elif method in (b"set_verifier", b"set_contractor"):
+            require(sender == get(b"owner"), "sender is not owner")
+            require(len(args) == 2, f"{method.decode()} expects 2 args")
+            put(b"verifier_pk" if method == b"set_verifier" else b"contractor", args[1])
+        elif method == b"fund_escrow":
+            require(sender == get(b"owner"), "sender is not owner")
+            require(len(args) == 1, "fund_escrow expects 1 arg")
+        elif method == b"get_state":
+            pass
+        else:
+            raise LogicError("logic eval error: no matching branch")
+
+        self._check_schema(app)
+        return info
+
+    def _ed25519_verify(self, program, data, signature, public_key):
+        """AVM ed25519verify: the signature covers "ProgData" || hash(program) || data."""
+        if not isinstance(public_key, bytes) or len(public_key) != 32 or len(signature) != 64:
+            raise LogicError("logic eval error: ed25519verify invalid arguments")
+        try:
+            VerifyKey(public_key).verify(b"ProgData" + program_hash_bytes(program) + data, signature)
+            return True
+        except BadSignatureError:
+            return False
+
+    def _check_schema(self, app):
+        uints = sum(1 for value in app['global'].values() if isinstance(value, int))
+        byte_slices = len(app['global']) - uints
+        max_uints, max_bytes = app['global_schema']
+        if uints > max_uints or byte_slices > max_bytes:
+            raise LogicError(f"store integer count {uints}/{max_uints} or bytes count {byte_slices}/{max_bytes} exceeds schema")
+
+    def _app_create(self, txn, args):
+        self._charge(PATH_COSTS['create'])
+        if len(args) != 3:
+            raise LogicError("logic eval error: creation expects 3 args")
+
+        app_id = self.next_app_id
+        global_schema = txn.global_schema
+        local_schema = txn.local_schema
+        app = {
+            'creator': txn.sender,
+            'approval': txn.approval_program or b"",
+            'clear': txn.clear_program or b"",
+            'global': {
+                b"owner": args[0], b"contractor": args[1], b"verifier_pk": args[2],
+                b"total_ms": 0, b"cur_ms": 0, b"escrow": 0,
+            },
+            'global_schema': (global_schema.num_uints or 0, global_schema.num_byte_slices or 0) if global_schema else (0, 0),
+            'local_schema': (local_schema.num_uints or 0, local_schema.num_byte_slices or 0) if local_schema else (0, 0),
+        }
+
+        def undo():
+            self.apps.pop(app_id, None)
+            self.created_apps[txn.sender].discard(app_id)
+            self.next_app_id = app_id
+        undo.address = txn.sender
+        self._journal.append(undo)
+
+        self.next_app_id += 1
+        self.apps[app_id] = app
+        self.created_apps.setdefault(txn.sender, set()).add(app_id)
+        self._check_schema(app)
+        return {'application-index': app_id}
+
+    def _delete_app(self, app_id):
+        app = self.apps.pop(app_id)
+
+        def undo():
+            self.apps[app_id] = app
+            self.created_apps[app['creator']].add(app_id)
+        undo.address = app['creator']
+        self._journal.append(undo)
+        self.created_apps[app['creator']].discard(app_id)
+
+    def _set_programs(self, app_id, approval, clear):
+        app = self.apps[app_id]
+        previous = (app['approval'], app['clear'])
+
+        def undo():
+            app['approval'], app['clear'] = previous
+        self._journal.append(undo)
+        app['approval'], app['clear'] = approval, clear
+
+
+class LocalAlgodClient(algod.AlgodClient):
+    """AlgodClient that serves every request from a LocalLedger in-process."""
+
+    def __init__(self, ledger):
+        super().__init__("", "http://local-algod")
+        self.ledger = ledger
+
+    def algod_request(self, method, requrl, params=None, data=None, headers=None,
+                      response_format="json", timeout=30):
+        status, payload = self.ledger.handle(method, requrl, params, data)
+        if status != 200:
+            raise error.AlgodHTTPError(payload.get('message', ''), status)
+        if response_format == "msgpack":
+            return msgpack.packb(payload, use_bin_type=True)
+        return payload
+
+
+# ---------------------------
+# HTTP stand-in server
+# ---------------------------
+class LedgerBackend:
+    """Serve requests from a LocalLedger."""
+
+    def __init__(self, ledger):
+        self.ledger = ledger
+
+    def handle(self, method, path, query_string, body):
+        query = dict(parse.parse_qsl(query_string))
+        status, payload = self.ledger.handle(method, path[len('/v2'):], query, body)
+        if query.get('format') == 'msgpack' and status == 200:
+            return status, 'application/msgpack', msgpack.packb(payload, use_bin_type=True)
+        return status, 'application/json', json.dumps(payload).encode()
+
+
+class ReplayStore:
+    """
+    Recorded algod responses keyed by method, path, query and body digest.
+    Repeated identical requests replay their responses in recorded order;
+    once exhausted the last response is served again.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.responses = {}
+        self.cursors = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(method, path, query_string, body):
+        query = '&'.join(sorted(query_string.split('&'))) if query_string else ''
+        return f"{method} {path}?{query} {hashlib.sha256(body or b'').hexdigest()}"
+
+    def load(self):
+        with open(self.path) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self.responses.setdefault(entry['key'], []).append(entry)
+        return self
+
+    def record(self, key, status, content_type, response_body):
+        entry = {
+            'key': key,
+            'status': status,
+            'content_type': content_type,
+            'body': base64.b64encode(response_body).decode(),
+        }
+        with self._lock:
+            self.responses.setdefault(key, []).append(entry)
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+
+    def lookup(self, key):
+        with self._lock:
+            entries = self.responses.get(key)
+            if not entries:
+                return None
+            cursor = self.cursors.get(key, 0)
+            self.cursors[key] = cursor + 1
+            entry = entries[min(cursor, len(entries) - 1)]
+        return entry['status'], entry['content_type'], base64.b64decode(entry['body'])
+
+
+class RecordingBackend:
+    """Proxy requests to a real algod node and capture every response."""
+
+    def __init__(self, upstream, token, store, timeout=60):
+        self.upstream = upstream.rstrip('/')
+        self.token = token
+        self.store = store
+        self.timeout = timeout
+
+    def handle(self, method, path, query_string, body):
+        url = self.upstream + path + (f"?{query_string}" if query_string else '')
+        headers = {'User-Agent': 'fairlens-local-algod'}
+        if self.token:
+            headers.update({'X-Algo-API-Token': self.token, 'X-API-Key': self.token})
+        if body:
+            headers['Content-Type'] = 'application/x-binary'
+
+        req = request.Request(url, data=body if method == 'POST' else None, headers=headers, method=method)
+        try:
+            with request.urlopen(req, timeout=self.timeout) as resp:
+                status, content_type, response_body = resp.status, resp.headers.get('Content-Type', 'application/json'), resp.read()
+        except HTTPError as e:
+            status, content_type, response_body = e.code, e.headers.get('Content-Type', 'application/json'), e.read()
+        except (URLError, OSError) as e:
+            # Unreachable or timed-out upstream: nothing to record, answer like a gateway
+            reason = getattr(e, 'reason', e)
+            return 502, 'application/json', json.dumps({'message': f"upstream {self.upstream} unavailable: {reason}"}).encode()
+
+        self.store.record(ReplayStore.key(method, path, query_string, body), status, content_type, response_body)
+        return status, content_type, response_body
+
+
+class ReplayBackend:
+    """Serve previously recorded responses without any network access."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def handle(self, method, path, query_string, body):
+        recorded = self.store.lookup(ReplayStore.key(method, path, query_string, body))
+        if recorded is None:
+            return 404, 'application/json', json.dumps({'message': f"no recorded response for {method} {path}"}).encode()
+        return recorded
+
+
+class FaultProfile:
+    """
+    Injected latency and errors, optionally overridden per path prefix.
+
+    Profile files are JSON, e.g.
+        {"latency_ms": 20, "jitter_ms": 5, "error_rate": 0.01, "error_status": 503,
+         "routes": {"/v2/transactions": {"latency_ms": 150, "error_rate": 0.05}}}
+    """
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, error_status=503, routes=None, seed=None):
+        self.default = {
+            'latency_ms': latency_ms,
+            'jitter_ms': jitter_ms,
+            'error_rate': error_rate,
+            'error_status': error_status,
+        }
+        self.routes = routes or {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    SETTINGS = ('latency_ms', 'jitter_ms', 'error_rate', 'error_status')
+
+    @classmethod
+    def from_file(cls, path, seed=None):
+        """Load a JSON profile; raises ValueError naming any unknown or malformed setting."""
+        with open(path) as f:
+            profile = json.load(f)
+        if not isinstance(profile, dict):
+            raise ValueError("profile must be a JSON object")
+
+        profile = dict(profile)
+        routes = profile.pop('routes', {})
+        if not isinstance(routes, dict):
+            raise ValueError("'routes' must map path prefixes to settings")
+        cls._check_settings(profile, "profile")
+        for prefix, overrides in routes.items():
+            if not isinstance(overrides, dict):
+                raise ValueError(f"route {prefix!r} must map to an object of settings")
+            cls._check_settings(overrides, f"route {prefix!r}")
+        return cls(routes=routes, seed=seed, **profile)
+
+    @classmethod
+    def _check_settings(cls, settings, where):
+        unknown = sorted(set(settings) - set(cls.SETTINGS))
+        if unknown:
+            raise ValueError(f"unknown setting(s) in {where}: {', '.join(unknown)} "
+                             f"(expected {', '.join(cls.SETTINGS + ('routes',))})")
+        for name, value in settings.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"{name} in {where} must be a number, got {value!r}")
+
+    def settings(self, path):
+        settings = dict(self.default)
+        # Longest matching prefix wins
+        for prefix in sorted(self.routes, key=len, reverse=True):
+            if path.startswith(prefix):
+                settings.update(self.routes[prefix])
+                break
+        return settings
+
+    def apply(self, path):
+        """Sleep for the configured latency; return an error response to inject, if any."""
+        settings = self.settings(path)
+        with self._lock:
+            jitter = self._rng.uniform(-1, 1) * settings['jitter_ms']
+            fail = self._rng.random() < settings['error_rate']
+        delay = max(0.0, settings['latency_ms'] + jitter) / 1000.0
+        if delay:
+            time.sleep(delay)
+        if fail:
+            status = settings['error_status']
+            return status, 'application/json', json.dumps({'message': f"injected error {status}"}).encode()
+        return None
+
+
+class AlgodRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _dispatch(self, method):
+        url = parse.urlsplit(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b""
+
+        response = self.server.faults.apply(url.path) if self.server.faults else None
+        if response is None:
+            if url.path == '/health':
+                response = 200, 'application/json', b"null"
+            else:
+                try:
+                    response = self.server.backend.handle(method, url.path, url.query, body)
+                except Exception as e:
+                    # Answer instead of dropping the connection
+                    self.log_error("backend error on %s %s: %r", method, url.path, e)
+                    response = 500, 'application/json', json.dumps({'message': f"internal error: {e}"}).encode()
+
+        status, content_type, payload = response
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def log_error(self, format, *args):
+        # Errors are logged even without --verbose
+        super().log_message(format, *args)
+
+
+def make_server(host, port, backend, faults=None, verbose=False):
+    """Create a threaded HTTP server exposing backend as an algod v2 endpoint."""
+    server = ThreadingHTTPServer((host, port), AlgodRequestHandler)
+    server.daemon_threads = True
+    server.backend = backend
+    server.faults = faults
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local algod stand-in server for FairLens")
+    parser.add_argument('--host', default='127.0.0.1', help="bind address (default: %(default)s)")
+    parser.add_argument('--port', type=int, default=4001, help="bind port (default: %(default)s)")
+    parser.add_argument('--mode', choices=['ledger', 'record', 'replay'], default='ledger',
+                        help="serve an in-memory ledger, record a real node, or replay a recording (default: %(default)s)")
+    parser.add_argument('--round-time', type=float, default=0.0,
+                        help="ledger mode: seconds between blocks, 0 for a block per submission (default: %(default)s)")
+    parser.add_argument('--upstream', default=os.getenv('ALGOD_ADDRESS', 'https://testnet-api.4160.nodely.dev'),
+                        help="record mode: algod node to proxy (default: $ALGOD_ADDRESS or public TestNet)")
+    parser.add_argument('--upstream-token', default=os.getenv('ALGOD_TOKEN', ''),
+                        help="record mode: API token for the upstream node (default: $ALGOD_TOKEN)")
+    parser.add_argument('--replay-file', default='algod_replay.jsonl',
+                        help="file written in record mode and read in replay mode (default: %(default)s)")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="injected latency per request")
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help="uniform +/- jitter on the injected latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests answered with an error")
+    parser.add_argument('--error-status', type=int, default=503, help="HTTP status of injected errors (default: %(default)s)")
+    parser.add_argument('--profile', help="JSON latency/error profile with per-route overrides")
+    parser.add_argument('--seed', type=int, help="seed for injected jitter and errors")
+    parser.add_argument('--verbose', action='store_true', help="log every request")
+    args = parser.parse_args()
+
+    if args.profile:
+        try:
+            faults = FaultProfile.from_file(args.profile, seed=args.seed)
+        except (OSError, ValueError) as e:
+            print(f"❌ Invalid fault profile {args.profile}: {e}")
+            return 1
+    elif args.latency_ms or args.jitter_ms or args.error_rate:
+        faults = FaultProfile(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status, seed=args.seed)
+    else:
+        faults = None
+
+    ledger = None
+    if args.mode == 'ledger':
+        ledger = LocalLedger(round_time=args.round_time).start()
+        backend = LedgerBackend(ledger)
+    elif args.mode == 'record':
+        backend = RecordingBackend(args.upstream, args.upstream_token, ReplayStore(args.replay_file))
+    else:
+        try:
+            backend = ReplayBackend(ReplayStore(args.replay_file).load())
+        except OSError as e:
+            print(f"❌ Could not load replay file: {e}")
+            return 1
+
+    server = make_server(args.host, args.port, backend, faults, args.verbose)
+    print(f"🧪 Local algod stand-in ({args.mode} mode) on http://{args.host}:{args.port}")
+    if args.mode == 'ledger':
+        print(f"   Faucet address:  {FAUCET_ADDRESS}")
+        print(f"   Faucet mnemonic: {mnemonic.from_private_key(FAUCET_PRIVATE_KEY)}")
+    elif args.mode == 'record':
+        print(f"   Recording {args.upstream} to {args.replay_file}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if ledger is not None:
+            ledger.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
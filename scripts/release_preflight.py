@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+# scripts/release_preflight.py
+# Simulate-before-submit gate for FairLens verify_release transactions
+# Checks each release against the app's current state (cur_ms, proof present,
+# verifier signature, escrow vs m{i}_amt) and optionally the node's simulate
+# endpoint, caching app snapshots per (app, round), so high-volume batches
+# only submit releases that will succeed.
+#
+# Usage:
+#   python scripts/release_preflight.py signed.jsonl
+#   python backend/verifier_sign.py sign requests.jsonl | python scripts/release_preflight.py --simulate
+#   python scripts/release_preflight.py signed.jsonl --dry-run
+#
+# ed25519verify alone costs 1900 opcodes and one app call only gets 700, so
+# each release is sent as a group: the verify_release call followed by
+# get_state calls that pad the group's pooled opcode budget.
+
+import os
+import sys
+import json
+import base64
+import argparse
+import threading
+from collections import OrderedDict
+
+# Add scripts directory to path
+sys.path.append(os.path.dirname(__file__))
+
+try:
+    from nacl.signing import VerifyKey
+    from nacl.exceptions import BadSignatureError
+    from algosdk import account, constants, encoding, mnemonic
+    from algosdk.logic import get_application_address
+    from algosdk.transaction import ApplicationNoOpTxn, assign_group_id, wait_for_confirmation
+    from deploy_testnet import get_algod_client
+except ImportError as e:
+    print(f"Error importing preflight dependencies: {e}")
+    print("Please install them with: pip install -r backend/requirements.txt")
+    sys.exit(1)
+
+MIN_FEE = 1000
+
+# Opcode budget each top-level app call adds to its group's pool
+APP_CALL_BUDGET = 700
+# Cost of each method's path through the compiled approval program (TEAL v6),
+# counting ed25519verify at 1900
+VERIFY_RELEASE_COST = 2001
+GET_STATE_COST = 52
+# get_state calls sent with each release: 4 * 700 covers 2001 + 3 * 52
+BUDGET_PADDING_CALLS = 3
+RELEASE_GROUP_SIZE = 1 + BUDGET_PADDING_CALLS
+
+
+def itob(value):
+    return value.to_bytes(8, 'big')
+
+
+def decode_global_state(entries):
+    """Convert algod's global-state list into {key_bytes: int | bytes}."""
+    state = {}
+    for entry in entries or []:
+        value = entry['value']
+        key = base64.b64decode(entry['key'])
+        state[key] = value.get('uint', 0) if value['type'] == 2 else base64.b64decode(value.get('bytes', ''))
+    return state
+
+
+def approval_program_hash(approval_bytes):
+    """SHA-512/256("Program" || bytecode), the hash Ed25519Verify prefixes with "ProgData"."""
+    return encoding.checksum(b"Program" + approval_bytes)
+
+
+def fetch_app_snapshot(algod_client, app_id):
+    """Read the global state, approval program hash and escrow balance of a FairLens app."""
+    app_info = algod_client.application_info(app_id)
+    escrow_info = algod_client.account_info(get_application_address(app_id))
+    return {
+        'global': decode_global_state(app_info['params'].get('global-state')),
+        'approval_hash': approval_program_hash(base64.b64decode(app_info['params'].get('approval-program', ''))),
+        'balance': escrow_info.get('amount', 0),
+        'min_balance': escrow_info.get('min-balance', 0),
+    }
+
+
+def check_release(snapshot, index, message, signature, fee=MIN_FEE, min_fee=MIN_FEE, app_calls=RELEASE_GROUP_SIZE):
+    """
+    Evaluate the verify_release preconditions of contracts/fairlens_app.py
+    against a snapshot, for a release sent in a group of app_calls app calls
+    (the release plus get_state padding). Returns a list of reasons it would fail.
+    """
+    state = snapshot['global']
+    reasons = []
+
+    budget = app_calls * APP_CALL_BUDGET
+    cost = VERIFY_RELEASE_COST + (app_calls - 1) * GET_STATE_COST
+    if cost > budget:
+        reasons.append(f"group of {app_calls} app call(s) has opcode budget {budget}, release needs {cost}")
+
+    cur_ms = state.get(b"cur_ms", 0)
+    if index != cur_ms:
+        reasons.append(f"stale milestone index {index}, contract is at cur_ms={cur_ms}")
+
+    proof = state.get(b"proof_" + itob(index))
+    if not isinstance(proof, bytes) or proof == b"":
+        reasons.append(f"no proof submitted for milestone {index}")
+
+    # Ed25519Verify signs over "ProgData" || approval program hash || message
+    verifier_pk = state.get(b"verifier_pk")
+    try:
+        VerifyKey(verifier_pk).verify(b"ProgData" + snapshot['approval_hash'] + message, signature)
+    except (BadSignatureError, ValueError, TypeError):
+        reasons.append("attestation signature does not verify against verifier_pk for the approval program")
+
+    # The inner payment's fee is covered by the outer fee surplus, or else by the escrow
+    amount = state.get(b"m" + itob(index) + b"_amt", 0)
+    inner_fee = max(0, min_fee - (fee - min_fee))
+    available = snapshot['balance'] - snapshot['min_balance']
+    if available < amount + inner_fee:
+        reasons.append(f"escrow has {available} spendable microALGOs, release needs {amount + inner_fee}")
+
+    return reasons
+
+
+class ReleaseGate:
+    """
+    Pre-flight checks for verify_release calls.
+
+    App snapshots (and, with simulate=True, node simulation verdicts) are cached
+    per (app, round): a batch costs one status call plus one state read per
+    distinct app, and cached entries expire as soon as the round advances.
+    """
+
+    def __init__(self, algod_client, simulate=False, max_entries=4096):
+        self.algod_client = algod_client
+        self.simulate = simulate
+        self.max_entries = max_entries
+        self._snapshots = OrderedDict()  # (app_id, round) -> snapshot
+        self._verdicts = OrderedDict()   # (app_id, round, txid) -> reasons
+        self._claimed = set()            # (app_id, round, index) accepted this round
+        self._round = None
+        self._lock = threading.Lock()
+
+    def current_round(self):
+        """Fetch the node's last round and drop cache entries from earlier rounds."""
+        round_num = self.algod_client.status()['last-round']
+        with self._lock:
+            if round_num != self._round:
+                self._round = round_num
+                for cache in (self._snapshots, self._verdicts):
+                    for key in [key for key in cache if key[1] < round_num]:
+                        del cache[key]
+                self._claimed = {key for key in self._claimed if key[1] >= round_num}
+        return round_num
+
+    def _remember(self, cache, key, value):
+        with self._lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > self.max_entries:
+                cache.popitem(last=False)
+
+    def snapshot(self, app_id, round_num):
+        key = (app_id, round_num)
+        with self._lock:
+            if key in self._snapshots:
+                self._snapshots.move_to_end(key)
+                return self._snapshots[key]
+        snapshot = fetch_app_snapshot(self.algod_client, app_id)
+        self._remember(self._snapshots, key, snapshot)
+        return snapshot
+
+    def simulate_release(self, app_id, round_num, signed_group):
+        """Run the signed release group through the node's simulate endpoint; returns failure reasons."""
+        key = (app_id, round_num, signed_group[0].get_txid())
+        with self._lock:
+            if key in self._verdicts:
+                return self._verdicts[key]
+        result = self.algod_client.simulate_raw_transactions(signed_group)
+        failure = result['txn-groups'][0].get('failure-message')
+        reasons = [f"simulation failed: {failure}"] if failure else []
+        self._remember(self._verdicts, key, reasons)
+        return reasons
+
+    def preflight(self, signed_group, round_num=None, min_fee=MIN_FEE):
+        """
+        Check a signed release group (see build_release_group). Returns (ok, reasons).
+        Only the first release per (app, milestone) in a round is accepted.
+        """
+        txns = [signed_txn.transaction for signed_txn in signed_group]
+        txn = txns[0]
+        args = getattr(txn, 'app_args', None) or []
+        if len(args) != 4 or args[0] != b"verify_release":
+            return False, ["not a verify_release group"]
+        app_id = txn.index
+        index = int.from_bytes(args[1], 'big')
+        app_calls = sum(1 for group_txn in txns if group_txn.type == constants.appcall_txn)
+
+        if round_num is None:
+            round_num = self.current_round()
+        try:
+            reasons = check_release(self.snapshot(app_id, round_num), index, args[2], args[3],
+                                    txn.fee, min_fee, app_calls)
+            if not reasons and self.simulate:
+                reasons = self.simulate_release(app_id, round_num, signed_group)
+        except Exception as e:
+            return False, [f"pre-flight error: {e}"]
+
+        if not reasons:
+            claim = (app_id, round_num, index)
+            with self._lock:
+                if claim in self._claimed:
+                    reasons = [f"release for milestone {index} already submitted this round"]
+                else:
+                    self._claimed.add(claim)
+        return not reasons, reasons
+
+
+def build_release_txn(sender, params, app_id, index, message, signature):
+    """Build the unsigned verify_release application call."""
+    return ApplicationNoOpTxn(sender, params, app_id, [b"verify_release", index, message, signature])
+
+
+def build_release_group(sender, params, app_id, index, message, signature, padding_calls=BUDGET_PADDING_CALLS):
+    """
+    Build the unsigned release group: verify_release first, then padding_calls
+    get_state calls (distinct notes keep their txids apart) to pool enough
+    opcode budget for ed25519verify.
+    """
+    txns = [build_release_txn(sender, params, app_id, index, message, signature)]
+    txns += [ApplicationNoOpTxn(sender, params, app_id, [b"get_state"], note=f"budget {i}".encode())
+             for i in range(padding_calls)]
+    return assign_group_id(txns)
+
+
+def parse_release(release):
+    """Validate a release record; returns (app_id, index, message_bytes, signature_bytes)."""
+    if 'error' in release:
+        raise ValueError(release['error'])
+    for field in ('message', 'signature'):
+        if not isinstance(release[field], str):
+            raise ValueError(f"{field} must be a string")
+    return (int(release['app_id']), int(release['milestone_index']),
+            release['message'].encode('utf-8'), bytes.fromhex(release['signature']))
+
+
+def submit_releases(algod_client, private_key, releases, gate, dry_run=False):
+    """
+    Pre-flight and submit a batch of releases.
+    releases: iterable of dicts with app_id, milestone_index, message (str) and signature (hex);
+    records carrying an "error" (unparseable input lines) are rejected as-is.
+
+    A release for milestone i+1 of an app whose milestone i release is also
+    in the batch is deferred: it is checked again once milestone i confirms,
+    in the round after. Dry runs cannot wait for that and report it deferred.
+    Returns (confirmed, rejected, failed, deferred) lists of (release, detail) pairs.
+    """
+    sender = account.address_from_private_key(private_key)
+    confirmed, rejected, failed = [], [], []
+
+    pending = []
+    for release in releases:
+        try:
+            pending.append((release, parse_release(release)))
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            rejected.append((release, [f"invalid release record: {e}"]))
+    # Earlier milestones first, so chains within the batch defer rather than look stale
+    pending.sort(key=lambda item: item[1][1])
+
+    while pending:
+        params = algod_client.suggested_params()
+        round_num = gate.current_round()
+        queued = set()  # (app_id, index) accepted or deferred in this round
+        sent, deferred = [], []
+
+        for release, (app_id, index, message, signature) in pending:
+            if (app_id, index - 1) in queued:
+                queued.add((app_id, index))
+                deferred.append((release, (app_id, index, message, signature)))
+                continue
+
+            group = build_release_group(sender, params, app_id, index, message, signature)
+            signed_group = [txn.sign(private_key) for txn in group]
+            ok, reasons = gate.preflight(signed_group, round_num, params.min_fee)
+            if not ok:
+                rejected.append((release, reasons))
+                continue
+            queued.add((app_id, index))
+            if dry_run:
+                confirmed.append((release, None))
+                continue
+            try:
+                sent.append((release, algod_client.send_transactions(signed_group)))
+            except Exception as e:
+                failed.append((release, str(e)))
+
+        for release, tx_id in sent:
+            try:
+                wait_for_confirmation(algod_client, tx_id, 4)
+                confirmed.append((release, tx_id))
+            except Exception as e:
+                failed.append((release, str(e)))
+
+        if dry_run:
+            return confirmed, rejected, failed, [
+                (release, f"waits for milestone {index - 1} in this batch")
+                for release, (_, index, _, _) in deferred
+            ]
+        pending = deferred
+
+    return confirmed, rejected, failed, []
+
+
+def parse_release_line(source, line_number, line):
+    """Parse one JSONL record; unparseable lines become {"source", "line", "error"} records."""
+    try:
+        release = json.loads(line)
+    except ValueError as e:
+        return {'source': source, 'line': line_number, 'error': f"invalid JSON: {e}"}
+    if not isinstance(release, dict):
+        return {'source': source, 'line': line_number, 'error': "record is not a JSON object"}
+    return release
+
+
+def iter_batches(paths, size):
+    """Read JSONL release records from files (or stdin) in batches."""
+    batch = []
+    for path in paths or ['-']:
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8')
+        try:
+            for line_number, line in enumerate(stream, 1):
+                if line.strip():
+                    batch.append(parse_release_line("<stdin>" if path == '-' else path, line_number, line))
+                    if len(batch) >= size:
+                        yield batch
+                        batch = []
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+    if batch:
+        yield batch
+
+
+def describe_release(release):
+    if 'error' in release:
+        return f"{release['source']} line {release['line']}"
+    return f"app {release.get('app_id')} ms {release.get('milestone_index')}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-flight and submit FairLens milestone releases")
+    parser.add_argument('inputs', nargs='*', help="JSONL signed attestations, e.g. from verifier_sign.py sign (default: stdin)")
+    parser.add_argument('--simulate', action='store_true',
+                        help="also run releases that pass the local checks through the node's simulate endpoint")
+    parser.add_argument('--dry-run', action='store_true', help="only report which releases would be submitted")
+    parser.add_argument('--batch-size', type=int, default=256, help="releases per batch (default: %(default)s)")
+    args = parser.parse_args()
+
+    releaser_mnemonic = os.getenv('RELEASER_MNEMONIC') or os.getenv('DEPLOYER_MNEMONIC')
+    if not releaser_mnemonic:
+        print("❌ RELEASER_MNEMONIC or DEPLOYER_MNEMONIC is required to send releases")
+        return 1
+
+    private_key = mnemonic.to_private_key(releaser_mnemonic)
+    algod_client = get_algod_client()
+    gate = ReleaseGate(algod_client, simulate=args.simulate)
+
+    print("🛫 FairLens Release Pre-flight")
+    print("=" * 50)
+
+    totals = {'confirmed': 0, 'deferred': 0, 'rejected': 0, 'failed': 0}
+    for batch in iter_batches(args.inputs, args.batch_size):
+        confirmed, rejected, failed, deferred = submit_releases(algod_client, private_key, batch, gate, args.dry_run)
+        totals['confirmed'] += len(confirmed)
+        totals['deferred'] += len(deferred)
+        totals['rejected'] += len(rejected)
+        totals['failed'] += len(failed)
+
+        for release, detail in deferred:
+            print(f"   ⏳ {describe_release(release)}: {detail}")
+        for release, reasons in rejected:
+            print(f"   ⏭️  {describe_release(release)}: {'; '.join(reasons)}")
+        for release, detail in failed:
+            print(f"   ❌ {describe_release(release)}: {detail}")
+
+    if args.dry_run:
+        print(f"\n✓ Would submit {totals['confirmed']}, deferred {totals['deferred']} until earlier milestones land, "
+              f"would fail {totals['rejected']}")
+    else:
+        print(f"\n✓ Released {totals['confirmed']}, would fail {totals['rejected']} (skipped by pre-flight), "
+              f"failed {totals['failed']}")
+    # Deferred releases are retried in a real run; anything else left behind is dropped work
+    return 1 if totals['rejected'] or totals['failed'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,9 @@
+# tests/conftest.py
+# Make the backend, contracts and scripts modules importable from the tests
+
+import os
+import sys
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..')
+for directory in ('backend', 'contracts', 'scripts'):
+    sys.path.insert(0, os.path.abspath(os.path.join(ROOT_DIR, directory)))
@@ -0,0 +1,39 @@
+# tests/test_benchmark.py
+# Unit tests for the benchmark regression gate
+
+import benchmark
+
+
+def make_report(**medians):
+    return {'benchmarks': {name: {'median_us': median} for name, median in medians.items()}}
+
+
+def test_compare_flags_slowdown_past_threshold():
+    baseline = make_report(sign=100.0, verify=100.0)
+    report = make_report(sign=111.0, verify=105.0)
+    assert benchmark.compare(report, baseline, 10.0) == ['sign']
+
+
+def test_compare_threshold_is_exclusive():
+    baseline = make_report(sign=100.0)
+    assert benchmark.compare(make_report(sign=110.0), baseline, 10.0) == []
+    assert benchmark.compare(make_report(sign=110.001), baseline, 10.0) == ['sign']
+
+
+def test_compare_ignores_speedups_and_zero_threshold():
+    baseline = make_report(sign=100.0)
+    assert benchmark.compare(make_report(sign=50.0), baseline, 0.0) == []
+    assert benchmark.compare(make_report(sign=100.5), baseline, 0.0) == ['sign']
+
+
+def test_compare_skips_benchmarks_missing_from_baseline():
+    baseline = make_report(sign=100.0)
+    report = make_report(sign=100.0, new_benchmark=1e9)
+    assert benchmark.compare(report, baseline, 10.0) == []
+
+
+def test_compare_ignores_baseline_only_and_invalid_entries():
+    baseline = make_report(sign=0.0, removed=10.0)
+    assert benchmark.compare(make_report(sign=5.0), baseline, 10.0) == []
+    assert benchmark.compare(make_report(sign=5.0), {}, 10.0) == []
+
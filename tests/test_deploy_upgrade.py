@@ -0,0 +1,90 @@
+# tests/test_deploy_upgrade.py
+# Upgrade-mode tests for deploy_testnet.py against the in-process algod stand-in
+
+import json
+
+import pytest
+from algosdk import account
+from algosdk.transaction import PaymentTxn, wait_for_confirmation
+
+from deploy_testnet import (
+    build_create_txn, compile_contract, compile_program, fetch_deployed_app,
+    plan_upgrades, upgrade_contracts
+)
+from local_algod import LocalLedger, LocalAlgodClient, FAUCET_ADDRESS, FAUCET_PRIVATE_KEY
+
+
+@pytest.fixture
+def algod_client():
+    ledger = LocalLedger().start()
+    yield LocalAlgodClient(ledger)
+    ledger.stop()
+
+
+def send(algod_client, signed_txn):
+    tx_id = algod_client.send_transaction(signed_txn)
+    return wait_for_confirmation(algod_client, tx_id, 4)
+
+
+def create_app(algod_client, owner_address, approval_bytes=b"\x06old"):
+    """Create an app from the faucet whose owner global is owner_address."""
+    _, contractor_address = account.generate_account()
+    txn = build_create_txn(
+        FAUCET_ADDRESS, algod_client.suggested_params(), approval_bytes, b"\x06\x81\x01",
+        owner_address, contractor_address, bytes(32)
+    )
+    return send(algod_client, txn.sign(FAUCET_PRIVATE_KEY))['application-index']
+
+
+def funded_account(algod_client):
+    private_key, address = account.generate_account()
+    txn = PaymentTxn(FAUCET_ADDRESS, algod_client.suggested_params(), address, 1_000_000)
+    send(algod_client, txn.sign(FAUCET_PRIVATE_KEY))
+    return private_key, address
+
+
+def test_fetch_deployed_app_reads_owner(algod_client):
+    _, owner_address = account.generate_account()
+    app_id = create_app(algod_client, owner_address)
+    approval, clear, owner = fetch_deployed_app(algod_client, app_id)
+    assert (approval, clear, owner) == (b"\x06old", b"\x06\x81\x01", owner_address)
+
+
+def test_plan_upgrades_fails_outdated_apps_owned_by_another_account(algod_client):
+    _, owner_address = account.generate_account()
+    _, other_address = account.generate_account()
+    outdated_app = create_app(algod_client, owner_address)
+    current_app = create_app(algod_client, owner_address, approval_bytes=b"\x06new")
+
+    outdated, up_to_date, failed = plan_upgrades(
+        algod_client, [outdated_app, current_app], b"\x06new", b"\x06\x81\x01", other_address
+    )
+    assert outdated == []
+    assert up_to_date == [current_app]
+    assert isinstance(failed[outdated_app], PermissionError)
+
+    outdated, _, failed = plan_upgrades(
+        algod_client, [outdated_app], b"\x06new", b"\x06\x81\x01", owner_address
+    )
+    assert outdated == [outdated_app] and failed == {}
+
+
+def test_upgrade_contracts_sends_nothing_for_foreign_apps(algod_client, tmp_path):
+    owner_key, owner_address = funded_account(algod_client)
+    other_key, _ = funded_account(algod_client)
+    owned_app = create_app(algod_client, owner_address)
+    foreign_app = create_app(algod_client, FAUCET_ADDRESS)
+
+    manifest_path = tmp_path / 'deployment.json'
+    manifest_path.write_text(json.dumps({'apps': [{'app_id': owned_app}, {'app_id': foreign_app}]}))
+
+    assert not upgrade_contracts(algod_client, other_key, str(manifest_path))
+    assert fetch_deployed_app(algod_client, owned_app)[0] == b"\x06old"
+
+    assert not upgrade_contracts(algod_client, owner_key, str(manifest_path))
+    approval_teal, _ = compile_contract()
+    assert fetch_deployed_app(algod_client, owned_app)[0] == compile_program(algod_client, approval_teal)
+    assert fetch_deployed_app(algod_client, foreign_app)[0] == b"\x06old"
+
+    entries = json.loads(manifest_path.read_text())['apps']
+    assert 'approval_hash' in entries[0] and 'approval_hash' not in entries[1]
@@ -0,0 +1,74 @@
+# tests/test_load_generator.py
+# Unit tests for the lifecycle load generator's statistics and a small offline run
+
+import argparse
+
+import pytest
+
+import load_generator
+from load_generator import arrival_offsets, build_report, percentile, window_rate
+from deploy_testnet import compile_contract, compile_program
+from local_algod import LocalLedger, LocalAlgodClient
+
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 11))
+    assert percentile(values, 50) == 5
+    assert percentile(values, 95) == 10
+    assert percentile(values, 99) == 10
+    assert percentile(values, 0) == 1
+    assert percentile([7], 99) == 7
+    assert percentile([], 50) == 0.0
+
+
+def test_window_rate_ignores_ramp_up():
+    assert window_rate([]) == 0.0
+    assert window_rate([5.0]) == 0.0
+    assert window_rate([3.0, 3.0]) == 0.0
+    assert window_rate([10.0, 12.0, 11.0]) == 1.0
+
+
+def test_arrival_offsets_are_open_loop_and_seeded():
+    assert arrival_offsets(4, 2.0, 'uniform', 1) == [0.0, 0.5, 1.0, 1.5]
+
+    poisson = arrival_offsets(2000, 50.0, 'poisson', 7)
+    assert poisson == arrival_offsets(2000, 50.0, 'poisson', 7)
+    assert poisson != arrival_offsets(2000, 50.0, 'poisson', 8)
+    assert poisson[0] == 0.0 and poisson == sorted(poisson)
+    assert poisson[-1] / (len(poisson) - 1) == pytest.approx(1 / 50.0, rel=0.1)
+
+
+def test_small_run_against_local_ledger():
+    args = argparse.Namespace(projects=3, rate=50.0, arrival='uniform', milestones=2,
+                              round_time=0.0, max_inflight=4, seed=1)
+    ledger = LocalLedger().start()
+    try:
+        algod_client = LocalAlgodClient(ledger)
+        approval_teal, clear_teal = compile_contract()
+        programs = (compile_program(algod_client, approval_teal), compile_program(algod_client, clear_teal))
+        projects = load_generator.make_projects(args.projects, args.milestones)
+        load_generator.fund_accounts(algod_client, projects)
+
+        recorder, duration, last_arrival = load_generator.run_load(
+            algod_client, projects, programs, args.rate, args.arrival, args.seed, args.max_inflight
+        )
+    finally:
+        ledger.stop()
+
+    report = build_report(recorder, duration, last_arrival, args)
+    assert report['errors'] == {}
+    assert report['completed_projects'] == 3
+    assert report['stages']['create']['count'] == 3
+    assert report['stages']['verify_release']['count'] == 6
+    assert report['offered_projects_per_sec'] == pytest.approx(50.0, rel=0.5)
+    # Every milestone was paid out on the ledger
+    assert all(app['global'][b"cur_ms"] == 2 for app in ledger.apps.values())
+
+
+@pytest.mark.parametrize("argv", [['--rate', '0'], ['--rate', '-1'], ['--projects', '0'], ['--milestones', '4']])
+def test_invalid_arguments_fail_before_any_work(monkeypatch, argv):
+    monkeypatch.setattr('sys.argv', ['load_generator.py'] + argv)
+    monkeypatch.setattr(load_generator, 'LocalLedger', None)  # would fail loudly if reached
+    with pytest.raises(SystemExit) as excinfo:
+        load_generator.main()
+    assert excinfo.value.code == 2
@@ -0,0 +1,140 @@
+# tests/test_local_algod.py
+# Offline tests for the algod stand-in's request handling: record/replay, fault injection and malformed input
+
+import base64
+import threading
+
+import msgpack
+import pytest
+from algosdk import account
+from algosdk.error import AlgodHTTPError
+from algosdk.v2client import algod
+from algosdk.transaction import PaymentTxn, wait_for_confirmation
+
+from local_algod import (
+    LocalLedger, LocalAlgodClient, LedgerBackend, RecordingBackend, ReplayBackend, ReplayStore,
+    FaultProfile, make_server, FAUCET_ADDRESS, FAUCET_PRIVATE_KEY
+)
+
+
+def serve(backend, faults=None):
+    """Start a stand-in server on a free port; returns (server, client)."""
+    server = make_server('127.0.0.1', 0, backend, faults)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = algod.AlgodClient('', f"http://127.0.0.1:{server.server_address[1]}")
+    return server, client
+
+
+def shutdown(server):
+    server.shutdown()
+    server.server_close()
+
+
+def payment_session(client, receiver):
+    """A fixed sequence of algod calls whose request bodies are deterministic."""
+    params = client.suggested_params()
+    signed_txn = PaymentTxn(FAUCET_ADDRESS, params, receiver, 250_000).sign(FAUCET_PRIVATE_KEY)
+    tx_id = client.send_transaction(signed_txn)
+    confirmed = wait_for_confirmation(client, tx_id, 4)
+    return tx_id, confirmed['confirmed-round'], client.account_info(receiver)['amount']
+
+
+def test_record_then_replay_round_trip(tmp_path):
+    _, receiver = account.generate_account()
+    replay_file = str(tmp_path / 'replay.jsonl')
+
+    ledger = LocalLedger().start()
+    ledger_server, _ = serve(LedgerBackend(ledger))
+    upstream = f"http://127.0.0.1:{ledger_server.server_address[1]}"
+    recording_server, recording_client = serve(RecordingBackend(upstream, '', ReplayStore(replay_file)))
+    try:
+        recorded = payment_session(recording_client, receiver)
+    finally:
+        shutdown(recording_server)
+        shutdown(ledger_server)
+        ledger.stop()
+    assert recorded[2] == 250_000
+
+    # The upstream is gone; every response now comes from the recording
+    replay_server, replay_client = serve(ReplayBackend(ReplayStore(replay_file).load()))
+    try:
+        assert payment_session(replay_client, receiver) == recorded
+        with pytest.raises(Exception, match="no recorded response"):
+            replay_client.application_info(4242)
+    finally:
+        shutdown(replay_server)
+
+
+def test_route_overrides_use_longest_prefix():
+    faults = FaultProfile(latency_ms=10, error_rate=0.1, routes={
+        '/v2': {'latency_ms': 20},
+        '/v2/transactions': {'latency_ms': 150, 'error_rate': 0.5},
+    })
+    assert faults.settings('/health') == {'latency_ms': 10, 'jitter_ms': 0.0, 'error_rate': 0.1, 'error_status': 503}
+    assert faults.settings('/v2/status')['latency_ms'] == 20
+    assert faults.settings('/v2/status')['error_rate'] == 0.1
+    assert faults.settings('/v2/transactions/params')['latency_ms'] == 150
+    assert faults.settings('/v2/transactions/params')['error_rate'] == 0.5
+
+
+def test_seeded_error_injection_is_reproducible():
+    def outcomes(seed):
+        faults = FaultProfile(error_rate=0.5, error_status=429, seed=seed)
+        return [faults.apply('/v2/status') for _ in range(200)]
+
+    first = outcomes(7)
+    assert first == outcomes(7)
+    assert first != outcomes(8)
+    errors = [response for response in first if response is not None]
+    assert 0 < len(errors) < 200
+    assert all(status == 429 for status, _, _ in errors)
+
+
+def test_profile_with_unknown_setting_is_rejected(tmp_path):
+    profile = tmp_path / 'profile.json'
+    profile.write_text('{"latency_ms": 5, "routes": {"/v2/status": {"error_pct": 1}}}')
+    with pytest.raises(ValueError, match="unknown setting.*error_pct"):
+        FaultProfile.from_file(str(profile))
+
+    profile.write_text('{"latency_ms": 5, "routes": {"/v2/status": {"error_rate": 0.2}}}')
+    assert FaultProfile.from_file(str(profile), seed=1).settings('/v2/status')['error_rate'] == 0.2
+
+
+@pytest.mark.parametrize("body", [b"garbage", msgpack.packb({"foo": 1}), msgpack.packb({"txn": {"type": "pay"}}), b"\xc1"])
+def test_malformed_transactions_are_rejected_with_400(body):
+    ledger = LocalLedger()
+    status, payload = ledger.handle('POST', '/transactions', {}, body)
+    assert status == 400 and payload['message']
+
+    with pytest.raises(AlgodHTTPError) as excinfo:
+        LocalAlgodClient(ledger).send_raw_transaction(base64.b64encode(body))
+    assert excinfo.value.code == 400
+
+
+def test_unreachable_upstream_answers_502(tmp_path):
+    store = ReplayStore(str(tmp_path / 'replay.jsonl'))
+    server, client = serve(RecordingBackend('http://127.0.0.1:1', '', store, timeout=2))
+    try:
+        with pytest.raises(AlgodHTTPError) as excinfo:
+            client.status()
+        assert excinfo.value.code == 502
+        assert "unavailable" in str(excinfo.value)
+    finally:
+        shutdown(server)
+    assert store.responses == {}
+
+
+def test_backend_exceptions_answer_500():
+    class BrokenBackend:
+        def handle(self, method, path, query_string, body):
+            raise RuntimeError("boom")
+
+    server, client = serve(BrokenBackend())
+    try:
+        with pytest.raises(AlgodHTTPError) as excinfo:
+            client.status()
+        assert excinfo.value.code == 500
+        # The server keeps serving after the error
+        assert client.health() is None
+    finally:
+        shutdown(server)
@@ -0,0 +1,168 @@
+# tests/test_local_ledger.py
+# FairLens application logic of the algod stand-in's in-memory ledger
+
+import pytest
+from algosdk import account
+from algosdk.logic import get_application_address
+from algosdk.transaction import ApplicationNoOpTxn, PaymentTxn, assign_group_id, wait_for_confirmation
+
+from deploy_testnet import build_create_txn
+from local_algod import LocalLedger, LocalAlgodClient, FAUCET_ADDRESS, FAUCET_PRIVATE_KEY, MIN_BALANCE, program_hash_bytes
+from release_preflight import build_release_group
+from verifier_sign import FairLensVerifier
+
+APPROVAL = b"#pragma version 6\nfairlens approval"
+AMOUNT = 250_000
+
+
+class Project:
+    """An owner, contractor and verifier with a funded FairLens app on a fresh ledger."""
+
+    def __init__(self, algod_client, milestones=1, escrow=None):
+        self.client = algod_client
+        self.verifier = FairLensVerifier()
+        self.owner_key, self.owner = self.funded(10_000_000)
+        self.contractor_key, self.contractor = self.funded(1_000_000)
+
+        txn = build_create_txn(self.owner, self.params(), APPROVAL, b"\x06\x81\x01",
+                               self.owner, self.contractor, self.verifier.get_public_key_bytes())
+        self.app_id = self.send(txn, self.owner_key)['application-index']
+        self.app_address = get_application_address(self.app_id)
+        escrow = milestones * (AMOUNT + 1000) + MIN_BALANCE if escrow is None else escrow
+        self.send(PaymentTxn(self.owner, self.params(), self.app_address, escrow), self.owner_key)
+        for index in range(milestones):
+            self.call(self.owner_key, self.owner, [b"add_ms", index, AMOUNT, 0, b"QmMilestone"])
+
+    def params(self):
+        return self.client.suggested_params()
+
+    def funded(self, amount):
+        private_key, address = account.generate_account()
+        self.send(PaymentTxn(FAUCET_ADDRESS, self.params(), address, amount), FAUCET_PRIVATE_KEY)
+        return private_key, address
+
+    def send(self, txn, private_key):
+        return wait_for_confirmation(self.client, self.client.send_transaction(txn.sign(private_key)), 4)
+
+    def send_group(self, txns, private_key):
+        signed = [txn.sign(private_key) for txn in assign_group_id(txns)]
+        return wait_for_confirmation(self.client, self.client.send_transactions(signed), 4)
+
+    def call(self, private_key, sender, args):
+        return self.send(ApplicationNoOpTxn(sender, self.params(), self.app_id, args), private_key)
+
+    def submit_proof(self, index=0):
+        return self.call(self.contractor_key, self.contractor, [b"submit_proof", index, b"QmProof"])
+
+    def release(self, index=0, program=APPROVAL, padding_calls=3):
+        message, signature = self.verifier.sign_attestation(
+            self.app_id, index, "PASS", "QmMilestone", "QmProof",
+            program_hash=program_hash_bytes(program) if program is not None else None
+        )
+        group = build_release_group(self.contractor, self.params(), self.app_id, index, message, signature, padding_calls)
+        signed = [txn.sign(self.contractor_key) for txn in group]
+        return wait_for_confirmation(self.client, self.client.send_transactions(signed), 4)
+
+    def state(self):
+        return self.client.ledger.apps[self.app_id]['global']
+
+    def balance(self, address):
+        return self.client.account_info(address)['amount']
+
+
+@pytest.fixture
+def algod_client():
+    ledger = LocalLedger().start()
+    yield LocalAlgodClient(ledger)
+    ledger.stop()
+
+
+@pytest.fixture
+def project(algod_client):
+    return Project(algod_client)
+
+
+def test_verify_release_pays_contractor(project):
+    project.submit_proof()
+    contractor_before = project.balance(project.contractor)
+    escrow_before = project.balance(project.app_address)
+
+    info = project.release()
+
+    assert info['inner-txns'][0]['txn']['txn']['amt'] == AMOUNT
+    assert project.balance(project.contractor) == contractor_before + AMOUNT - 4 * 1000
+    assert project.balance(project.app_address) == escrow_before - AMOUNT - 1000
+    assert project.state()[b"cur_ms"] == 1
+    assert project.state()[b"escrow"] == 0
+
+
+@pytest.mark.parametrize("attempt, reason", [
+    (lambda project: project.release(index=1), "not the current milestone"),
+    (lambda project: project.release(program=None), "ed25519verify failed"),
+    (lambda project: project.release(program=b"another program"), "ed25519verify failed"),
+    (lambda project: project.release(padding_calls=0), "dynamic cost budget exceeded"),
+    (lambda project: project.release(padding_calls=2), "dynamic cost budget exceeded"),
+])
+def test_verify_release_failures_leave_state_untouched(project, attempt, reason):
+    project.submit_proof()
+    contractor_before = project.balance(project.contractor)
+    state_before = dict(project.state())
+
+    with pytest.raises(Exception, match=reason):
+        attempt(project)
+
+    assert project.state() == state_before
+    assert project.balance(project.contractor) == contractor_before
+
+
+def test_verify_release_requires_proof(project):
+    with pytest.raises(Exception, match="proof missing"):
+        project.release()
+    assert project.state()[b"cur_ms"] == 0
+
+
+def test_verify_release_requires_escrow_above_min_balance(algod_client):
+    project = Project(algod_client, escrow=MIN_BALANCE + AMOUNT)
+    project.submit_proof()
+    with pytest.raises(Exception, match="below"):
+        project.release()
+    assert project.state()[b"cur_ms"] == 0
+
+
+def test_only_owner_adds_milestones_and_only_contractor_proves(project):
+    with pytest.raises(Exception, match="sender is not owner"):
+        project.call(project.contractor_key, project.contractor, [b"add_ms", 1, AMOUNT, 0, b"QmMilestone"])
+    with pytest.raises(Exception, match="sender is not contractor"):
+        project.call(project.owner_key, project.owner, [b"submit_proof", 0, b"QmProof"])
+    with pytest.raises(Exception, match="not the current milestone"):
+        project.submit_proof(index=1)
+
+
+def test_global_schema_caps_milestones_at_three(algod_client):
+    project = Project(algod_client, milestones=3)
+    assert project.state()[b"total_ms"] == 3
+    with pytest.raises(Exception, match="exceeds schema"):
+        project.call(project.owner_key, project.owner, [b"add_ms", 3, AMOUNT, 0, b"QmMilestone"])
+    assert project.state()[b"total_ms"] == 3
+
+
+def test_payments_keep_min_balance(project):
+    owner_balance = project.balance(project.owner)
+    _, receiver = account.generate_account()
+    with pytest.raises(Exception, match="below min"):
+        project.send(PaymentTxn(project.owner, project.params(), receiver, owner_balance - 2000), project.owner_key)
+    assert project.balance(project.owner) == owner_balance
+
+
+def test_failing_group_rolls_back_earlier_transactions(project):
+    owner_balance = project.balance(project.owner)
+    _, receiver = account.generate_account()
+    payment = PaymentTxn(project.owner, project.params(), receiver, 500_000)
+    bad_call = ApplicationNoOpTxn(project.owner, project.params(), project.app_id, [b"submit_proof", 0, b"QmProof"])
+
+    with pytest.raises(Exception, match="sender is not contractor"):
+        project.send_group([payment, bad_call], project.owner_key)
+
+    assert project.balance(project.owner) == owner_balance
+    assert project.balance(receiver) == 0
+    assert b"proof_" + (0).to_bytes(8, 'big') not in project.state()
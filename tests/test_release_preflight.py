@@ -0,0 +1,246 @@
+# tests/test_release_preflight.py
+# Unit tests for the verify_release pre-flight checks and ReleaseGate caching
+
+import base64
+
+import pytest
+from algosdk import account
+from algosdk.logic import get_application_address
+from algosdk.transaction import SuggestedParams
+
+from release_preflight import (
+    APP_CALL_BUDGET, GET_STATE_COST, RELEASE_GROUP_SIZE, VERIFY_RELEASE_COST, ReleaseGate, approval_program_hash,
+    build_release_group, check_release, fetch_app_snapshot, iter_batches, itob, submit_releases
+)
+from verifier_sign import FairLensVerifier
+
+APP_ID = 1001
+APPROVAL = b"\x06fairlens approval"
+AMOUNT = 500_000
+
+
+class StubAlgod:
+    """Just enough of AlgodClient for ReleaseGate, with call counting."""
+
+    def __init__(self, verifier, cur_ms=0, proof=b"QmProof", balance=1_000_000):
+        self.round = 10
+        self.app_reads = 0
+        self.state = {
+            b"verifier_pk": verifier.get_public_key_bytes(),
+            b"cur_ms": cur_ms,
+            b"m" + itob(0) + b"_amt": AMOUNT,
+            b"m" + itob(1) + b"_amt": AMOUNT,
+        }
+        if proof is not None:
+            self.state[b"proof_" + itob(cur_ms)] = proof
+        self.balance = balance
+
+    def status(self):
+        return {'last-round': self.round}
+
+    def suggested_params(self):
+        return SuggestedParams(1000, self.round, self.round + 1000, base64.b64encode(bytes(32)).decode(),
+                               'testnet-v1.0', flat_fee=True, min_fee=1000)
+
+    def application_info(self, app_id):
+        self.app_reads += 1
+        global_state = [
+            {'key': base64.b64encode(key).decode(),
+             'value': {'type': 2, 'uint': value} if isinstance(value, int)
+             else {'type': 1, 'bytes': base64.b64encode(value).decode()}}
+            for key, value in self.state.items()
+        ]
+        return {'id': app_id, 'params': {'approval-program': base64.b64encode(APPROVAL).decode(),
+                                         'global-state': global_state}}
+
+    def account_info(self, address):
+        assert address == get_application_address(APP_ID)
+        return {'amount': self.balance, 'min-balance': 100_000}
+
+    def send_transactions(self, signed_group):
+        """Land a release in the next round: advance cur_ms and let the contractor prove the next one."""
+        index = int.from_bytes(signed_group[0].transaction.app_args[1], 'big')
+        self.state[b"cur_ms"] = index + 1
+        self.state[b"proof_" + itob(index + 1)] = b"QmProof"
+        self.balance -= AMOUNT + 1000
+        self.round += 1
+        return signed_group[0].get_txid()
+
+    def pending_transaction_info(self, tx_id):
+        return {'confirmed-round': self.round}
+
+
+@pytest.fixture
+def verifier():
+    return FairLensVerifier()
+
+
+def attest(verifier, index=0, program_hash=approval_program_hash(APPROVAL)):
+    return verifier.sign_attestation(APP_ID, index, "PASS", "QmHash", "QmProof", 1700000000, program_hash)
+
+
+def snapshot_of(algod_client):
+    return fetch_app_snapshot(algod_client, APP_ID)
+
+
+def signed_release(verifier, private_key, algod_client, index=0, **kwargs):
+    message, signature = attest(verifier, index)
+    sender = account.address_from_private_key(private_key)
+    group = build_release_group(sender, algod_client.suggested_params(), APP_ID, index, message, signature, **kwargs)
+    return [txn.sign(private_key) for txn in group]
+
+
+def test_check_release_passes_for_valid_release(verifier):
+    assert check_release(snapshot_of(StubAlgod(verifier)), 0, *attest(verifier)) == []
+
+
+def test_check_release_flags_stale_index(verifier):
+    snapshot = snapshot_of(StubAlgod(verifier, cur_ms=1))
+    reasons = check_release(snapshot, 0, *attest(verifier))
+    assert any("stale milestone index 0" in reason for reason in reasons)
+
+
+def test_check_release_flags_missing_proof(verifier):
+    reasons = check_release(snapshot_of(StubAlgod(verifier, proof=None)), 0, *attest(verifier))
+    assert reasons == ["no proof submitted for milestone 0"]
+
+
+def test_check_release_requires_program_bound_signature(verifier):
+    snapshot = snapshot_of(StubAlgod(verifier))
+    expected = ["attestation signature does not verify against verifier_pk for the approval program"]
+    # Signed over the bare message, as the AVM never checks
+    assert check_release(snapshot, 0, *attest(verifier, program_hash=None)) == expected
+    # Signed for another approval program
+    assert check_release(snapshot, 0, *attest(verifier, program_hash=bytes(32))) == expected
+    # Signed by another verifier
+    assert check_release(snapshot, 0, *attest(FairLensVerifier())) == expected
+
+
+def test_check_release_flags_underfunded_escrow(verifier):
+    snapshot = snapshot_of(StubAlgod(verifier, balance=100_000 + AMOUNT))
+    reasons = check_release(snapshot, 0, *attest(verifier))
+    assert reasons == [f"escrow has {AMOUNT} spendable microALGOs, release needs {AMOUNT + 1000}"]
+    # A doubled outer fee covers the inner payment
+    assert check_release(snapshot, 0, *attest(verifier), fee=2000) == []
+
+
+def test_release_group_pools_enough_budget(verifier):
+    algod_client = StubAlgod(verifier)
+    private_key, _ = account.generate_account()
+    group = [signed_txn.transaction for signed_txn in signed_release(verifier, private_key, algod_client)]
+
+    assert len(group) == RELEASE_GROUP_SIZE
+    assert group[0].app_args[0] == b"verify_release"
+    assert all(txn.app_args == [b"get_state"] and txn.index == APP_ID for txn in group[1:])
+    assert len({txn.group for txn in group}) == 1 and group[0].group is not None
+    assert len({txn.get_txid() for txn in group}) == len(group)
+    assert len(group) * APP_CALL_BUDGET >= VERIFY_RELEASE_COST + (len(group) - 1) * GET_STATE_COST
+
+
+def test_check_release_rejects_groups_short_of_budget(verifier):
+    snapshot = snapshot_of(StubAlgod(verifier))
+    for app_calls in (1, 3):
+        reasons = check_release(snapshot, 0, *attest(verifier), app_calls=app_calls)
+        assert reasons == [f"group of {app_calls} app call(s) has opcode budget {app_calls * APP_CALL_BUDGET}, "
+                           f"release needs {VERIFY_RELEASE_COST + (app_calls - 1) * GET_STATE_COST}"]
+
+    # A lone verify_release call never reaches the node
+    algod_client = StubAlgod(verifier)
+    private_key, _ = account.generate_account()
+    ok, reasons = ReleaseGate(algod_client).preflight(
+        signed_release(verifier, private_key, algod_client, padding_calls=0))
+    assert not ok and "opcode budget 700" in reasons[0]
+
+
+def test_gate_rejects_duplicate_claim_in_same_round(verifier):
+    algod_client = StubAlgod(verifier)
+    private_key, _ = account.generate_account()
+    gate = ReleaseGate(algod_client)
+
+    assert gate.preflight(signed_release(verifier, private_key, algod_client)) == (True, [])
+    ok, reasons = gate.preflight(signed_release(verifier, private_key, algod_client))
+    assert not ok and reasons == ["release for milestone 0 already submitted this round"]
+
+    # The claim expires with the round
+    algod_client.round += 1
+    assert gate.preflight(signed_release(verifier, private_key, algod_client))[0]
+
+
+def test_gate_caches_snapshots_per_round(verifier):
+    algod_client = StubAlgod(verifier)
+    gate = ReleaseGate(algod_client)
+
+    round_num = gate.current_round()
+    first = gate.snapshot(APP_ID, round_num)
+    assert gate.snapshot(APP_ID, round_num) is first
+    assert algod_client.app_reads == 1
+
+    algod_client.round += 1
+    algod_client.state[b"cur_ms"] = 1
+    next_round = gate.current_round()
+    assert (APP_ID, round_num) not in gate._snapshots
+    assert gate.snapshot(APP_ID, next_round)['global'][b"cur_ms"] == 1
+    assert algod_client.app_reads == 2
+
+
+def test_gate_cache_is_bounded(verifier):
+    gate = ReleaseGate(StubAlgod(verifier), max_entries=2)
+    for round_num in range(3):
+        gate.snapshot(APP_ID, round_num)
+    assert list(gate._snapshots) == [(APP_ID, 1), (APP_ID, 2)]
+
+
+def test_malformed_lines_are_rejected_without_aborting(tmp_path, verifier):
+    message, signature = attest(verifier)
+    good = f'{{"app_id": {APP_ID}, "milestone_index": 0, "message": "{message.decode()}", "signature": "{signature.hex()}"}}'
+    inputs = tmp_path / "signed.jsonl"
+    inputs.write_text("\n".join([
+        '{"app_id": 1001, "milestone_index": 0, "message": 123, "signature": "00"}',
+        '{not json',
+        '[1, 2]',
+        good,
+    ]) + "\n")
+
+    batches = list(iter_batches([str(inputs)], 2))
+    assert [len(batch) for batch in batches] == [2, 2]
+    assert batches[0][1]['line'] == 2 and "invalid JSON" in batches[0][1]['error']
+
+    algod_client = StubAlgod(verifier)
+    private_key, _ = account.generate_account()
+    gate = ReleaseGate(algod_client)
+    releases = [release for batch in batches for release in batch]
+    confirmed, rejected, failed, deferred = submit_releases(algod_client, private_key, releases, gate, dry_run=True)
+
+    assert [release['app_id'] for release, _ in confirmed] == [APP_ID]
+    assert len(rejected) == 3 and failed == [] and deferred == []
+    assert "message must be a string" in rejected[0][1][0]
+    assert "not a JSON object" in rejected[2][1][0]
+
+
+def release_record(verifier, index):
+    message, signature = attest(verifier, index)
+    return {'app_id': APP_ID, 'milestone_index': index, 'message': message.decode(), 'signature': signature.hex()}
+
+
+def test_chained_milestones_are_deferred_in_dry_run(verifier):
+    algod_client = StubAlgod(verifier)
+    private_key, _ = account.generate_account()
+    releases = [release_record(verifier, 1), release_record(verifier, 0)]
+    confirmed, rejected, failed, deferred = submit_releases(
+        algod_client, private_key, releases, ReleaseGate(algod_client), dry_run=True)
+
+    assert [release['milestone_index'] for release, _ in confirmed] == [0]
+    assert [(release['milestone_index'], detail) for release, detail in deferred] == [(1, "waits for milestone 0 in this batch")]
+    assert rejected == [] and failed == []
+
+
+def test_chained_milestones_are_released_in_later_rounds(verifier):
+    algod_client = StubAlgod(verifier, balance=100_000 + 3 * (AMOUNT + 1000))
+    private_key, _ = account.generate_account()
+    releases = [release_record(verifier, index) for index in (2, 0, 1)]
+    confirmed, rejected, failed, deferred = submit_releases(
+        algod_client, private_key, releases, ReleaseGate(algod_client))
+
+    assert [release['milestone_index'] for release, _ in confirmed] == [0, 1, 2]
+    assert rejected == [] and failed == [] and deferred == []
+    assert algod_client.state[b"cur_ms"] == 3
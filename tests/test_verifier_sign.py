@@ -0,0 +1,152 @@
+# tests/test_verifier_sign.py
+# Unit tests for the streaming JSONL sign/verify pipeline
+
+import io
+import json
+
+import pytest
+
+from verifier_sign import (
+    FairLensVerifier, sign_record, verify_record, process_chunk, run_pipeline, main
+)
+
+REQUEST = {"app_id": 7, "milestone_index": 1, "status": "PASS", "milestone_hash": "QmHash", "timestamp": 1700000000}
+PROGRAM_HASH = bytes(range(32))
+
+
+@pytest.fixture
+def verifier():
+    return FairLensVerifier()
+
+
+def lines(*records):
+    return [("test", number, json.dumps(record)) for number, record in enumerate(records, 1)]
+
+
+def test_sign_record_output_verifies(verifier):
+    signed = sign_record(verifier, REQUEST)
+    assert signed["message"] == "app:7|ms:1|status:PASS|ts:1700000000|hash:QmHash|proof:"
+    assert signed["verifier_pubkey"] == verifier.get_public_key_hex()
+    assert "program_hash" not in signed
+    assert verify_record(verifier.verify_key, signed)["valid"] is True
+
+
+def test_sign_record_keeps_explicit_zero_timestamp(verifier):
+    signed = sign_record(verifier, {**REQUEST, "timestamp": 0})
+    assert signed["timestamp"] == 0
+    assert "|ts:0|" in signed["message"]
+    assert verify_record(verifier.verify_key, signed)["valid"] is True
+
+    assert sign_record(verifier, {**REQUEST, "timestamp": None})["timestamp"] > 0
+
+
+def test_sign_record_binds_program_hash(verifier):
+    signed = sign_record(verifier, REQUEST, PROGRAM_HASH)
+    assert signed["program_hash"] == PROGRAM_HASH.hex()
+    assert verifier.verify_attestation(signed["message"].encode(), bytes.fromhex(signed["signature"]), PROGRAM_HASH)
+    assert verify_record(verifier.verify_key, signed)["valid"] is True
+
+    del signed["program_hash"]
+    assert verify_record(verifier.verify_key, signed)["reason"] == "bad signature"
+
+
+def test_verify_record_only_trusts_the_given_key(verifier):
+    attacker = FairLensVerifier()
+    forged = sign_record(attacker, REQUEST)
+    result = verify_record(verifier.verify_key, forged)
+    assert result["valid"] is False
+    assert result["reason"] == "verifier_pubkey is not the trusted verifier key"
+
+    # Without a claimed key the signature is still checked against the trusted one
+    del forged["verifier_pubkey"]
+    assert verify_record(verifier.verify_key, forged)["reason"] == "bad signature"
+
+
+def test_verify_record_rejects_tampered_message(verifier):
+    signed = sign_record(verifier, REQUEST)
+    signed["message"] = signed["message"].replace("PASS", "FAIL")
+    assert verify_record(verifier.verify_key, signed)["reason"] == "message does not match attestation fields"
+
+    for field in ("app_id", "milestone_index", "status", "milestone_hash", "timestamp"):
+        del signed[field]
+    assert verify_record(verifier.verify_key, signed)["reason"] == "bad signature"
+
+
+@pytest.mark.parametrize("record", [
+    {"message": 123, "signature": "00"},
+    {"message": "x", "signature": 5},
+    {"message": "x", "signature": "00", "verifier_pubkey": ["a"]},
+    {"message": "x", "signature": "zz"},
+    {"message": "x"},
+    ["not", "an", "object"],
+])
+def test_malformed_verify_records_become_errors(verifier, record):
+    output, errors, invalid = process_chunk("verify", lines(record), verifier.verify_key)
+    assert errors == 1 and invalid == 0
+    result = json.loads(output[0])
+    assert result["source"] == "test" and result["line"] == 1 and result["error"]
+
+
+def test_malformed_sign_records_do_not_abort_the_chunk(verifier):
+    output, errors, invalid = process_chunk("sign", lines({"app_id": 1}, REQUEST, {**REQUEST, "program_hash": "00"}), verifier)
+    assert errors == 2 and invalid == 0
+    results = [json.loads(line) for line in output]
+    assert "missing field(s)" in results[0]["error"]
+    assert results[1]["app_id"] == 7
+    assert "32 bytes" in results[2]["error"]
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_pipeline_with_workers(tmp_path, verifier, ordered):
+    requests = tmp_path / "requests.jsonl"
+    requests.write_text("".join(json.dumps({**REQUEST, "app_id": app_id}) + "\n" for app_id in range(60)))
+    private_key_hex = verifier.signing_key.encode().hex()
+
+    signed = io.StringIO()
+    assert run_pipeline("sign", private_key_hex, [str(requests)], signed, workers=2,
+                        chunk_size=4, ordered=ordered, progress_interval=0) == (0, 0)
+    app_ids = [json.loads(line)["app_id"] for line in signed.getvalue().splitlines()]
+    if ordered:
+        assert app_ids == list(range(60))
+    else:
+        assert sorted(app_ids) == list(range(60))
+
+    signed_path = tmp_path / "signed.jsonl"
+    signed_path.write_text(signed.getvalue())
+    verified = io.StringIO()
+    assert run_pipeline("verify", verifier.get_public_key_hex(), [str(signed_path)], verified,
+                        workers=2, chunk_size=4, ordered=ordered, progress_interval=0) == (0, 0)
+    assert all(json.loads(line)["valid"] for line in verified.getvalue().splitlines())
+
+    untrusted = FairLensVerifier().get_public_key_hex()
+    verified = io.StringIO()
+    assert run_pipeline("verify", untrusted, [str(signed_path)], verified, workers=2, chunk_size=4,
+                        ordered=ordered, progress_interval=0) == (0, 60)
+    assert not any(json.loads(line)["valid"] for line in verified.getvalue().splitlines())
+
+
+def test_unreadable_inputs_exit_2_before_any_work(tmp_path, capsys, verifier):
+    requests = tmp_path / "requests.jsonl"
+    requests.write_text(json.dumps(REQUEST) + "\n")
+    missing = tmp_path / "missing.jsonl"
+    key_hex = verifier.signing_key.encode().hex()
+
+    for inputs in ([str(missing)], [str(requests), str(missing)], [str(tmp_path)]):
+        assert main(["sign", "--key-hex", key_hex, "--progress-interval", "0"] + inputs) == 2
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "cannot read input file(s)" in captured.err and inputs[-1] in captured.err
+
+
+def test_invalid_records_are_counted_and_fail_the_job(tmp_path, capsys, verifier):
+    signed = [sign_record(verifier, REQUEST), sign_record(FairLensVerifier(), REQUEST)]
+    signed_path = tmp_path / "signed.jsonl"
+    signed_path.write_text("".join(json.dumps(record) + "\n" for record in signed))
+    argv = ["verify", "--pubkey-hex", verifier.get_public_key_hex(), "--progress-interval", "0", str(signed_path)]
+
+    assert main(argv) == 1
+    captured = capsys.readouterr()
+    assert [json.loads(line)["valid"] for line in captured.out.splitlines()] == [True, False]
+    assert "[done] 2 records, 0 errors, 1 invalid" in captured.err
+
+    assert main(argv + ["--allow-invalid"]) == 0